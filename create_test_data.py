@@ -112,6 +112,7 @@ def create_test_messages():
         {"from": "emma_test", "to": MAIN_USER, "content": "The design looks amazing!"},
     ]
     
+    batch = []
     for msg in messages:
         # Create room ID for DM (sorted usernames)
         users = sorted([msg["from"], msg["to"]])
@@ -125,8 +126,11 @@ def create_test_messages():
             "encrypted": False,
             "type": "text"
         }
-        
-        store.add_message(room_id, message)
+        batch.append((room_id, message))
+    
+    # One write for the whole batch
+    store.add_messages_bulk(batch)
+    for msg in messages:
         print(f"✅ Message from {msg['from']}: {msg['content'][:30]}...")
 
 def main():
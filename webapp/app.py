@@ -5,6 +5,8 @@ No heavy operations on startup.
 
 from flask import Flask, jsonify
 from flask_socketio import SocketIO
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 
 # ============================================
@@ -12,10 +14,53 @@ import os
 # ============================================
 
 app = Flask(__name__)
+
+# orjson serializes API responses in C; fall back to the stdlib provider if missing
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    
+    class OrjsonProvider(DefaultJSONProvider):
+        """jsonify/request.get_json backed by orjson - same output as the default provider"""
+        
+        def dumps(self, obj, **kwargs):
+            # response() passes compact separators (orjson's only style) or indent=2
+            indent = kwargs.pop('indent', None)
+            kwargs.pop('separators', None)
+            if kwargs or indent not in (None, 2):
+                return super().dumps(obj, indent=indent, **kwargs)
+            # Dates go through Flask's default() so they stay HTTP-date strings
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        
+        def loads(self, s, **kwargs):
+            if kwargs:
+                return super().loads(s, **kwargs)
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+except ImportError:
+    print("⚠️ orjson not installed - using stdlib JSON", flush=True)
+
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key')
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+# Trust X-Forwarded-For only for the proxies we actually sit behind (1 on Render),
+# so request.remote_addr is the real client and can't be spoofed by a header
+_proxy_hops = int(os.environ.get('PROXY_FIX_X_FOR', '0'))
+if _proxy_hops:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=_proxy_hops)
+
+# Workers are recycled every ~100 requests (Procfile --max-requests), so keep
+# compiled templates on disk instead of recompiling them in each new worker.
+# No path given: Jinja creates and checks its own per-user 0700 directory
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 # ============================================
 # ERROR HANDLERS
 # ============================================
@@ -30,6 +30,10 @@ class Config:
     MIN_PASSWORD_LENGTH = 8
     MIN_AGE = 18
     
+    # Auth rate limiting: POSTs per client IP per endpoint within the window
+    AUTH_RATE_LIMIT = int(os.environ.get('AUTH_RATE_LIMIT', '5'))
+    AUTH_RATE_WINDOW = 60  # seconds
+    
     # Channels
     MIN_CHANNEL_NAME_LENGTH = 3
     MAX_CHANNEL_DESCRIPTION_LENGTH = 500
@@ -3,13 +3,18 @@
 With performance monitoring for bottleneck detection.
 """
 
+import hashlib
+import heapq
 import os
+import re
 import secrets
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from functools import wraps
 
+from webapp.utils.passwords import hash_password, verify_password
+
 
 def timed_db_op(func):
     """Decorator to track database operation timing"""
@@ -52,6 +57,18 @@ def _connect_mongodb():
     return False
 
 
+def _phrase_hash(phrase: str) -> str:
+    """Hex SHA-256 of a shared-note phrase (digest().hex() skips hexdigest's extra copy)"""
+    return hashlib.sha256(phrase.encode()).digest().hex()
+
+
+# Bot fields a developer may change through update_bot()
+_BOT_UPDATABLE = frozenset({
+    'name', 'description', 'avatar', 'category', 'commands',
+    'webhook_url', 'website', 'privacy_policy', 'terms_of_service'
+})
+
+
 class DataStore:
     """
     Data store with MongoDB backend.
@@ -62,6 +79,7 @@ class DataStore:
     ROLE_ADMIN = 'admin'
     ROLE_MODERATOR = 'mod'
     ROLE_VIEWER = 'viewer'
+    POSTING_ROLES = (ROLE_ADMIN, ROLE_MODERATOR)
     
     # Interest categories
     INTEREST_CATEGORIES = {
@@ -82,6 +100,12 @@ class DataStore:
         self._username_cache = None
         self._username_cache_time = 0
         self._cache_ttl = 60
+        # username -> (premium, expires_at); Mongo mode only
+        self._premium_cache: Dict[str, Tuple[bool, float]] = {}
+        # Shared discover rankings - one computation serves every user
+        self._discover_cache = None
+        self._discover_cache_time = 0
+        self._discover_cache_gen = 0  # Bumped on invalidate; in-flight rankings are then not cached
         self._bots_initialized = False
         self._db_initialized = False
         
@@ -95,6 +119,23 @@ class DataStore:
         self.chat_settings: Dict[str, dict] = {}
         self.bots: Dict[str, dict] = {}
         self.online_users: Dict[str, str] = {}
+        
+        # Inverted indexes: username -> ids of groups they belong to and of
+        # groups/channels they administer (dicts used as insertion-ordered sets)
+        self._user_groups: Dict[str, Dict[str, None]] = {}
+        self._user_admin_groups: Dict[str, Dict[str, None]] = {}
+        self._user_admin_channels: Dict[str, Dict[str, None]] = {}
+        # developer -> ids of the bots they created
+        self._bots_by_developer: Dict[str, Dict[str, None]] = {}
+    
+    @staticmethod
+    def _set_admin_index(index: Dict[str, Dict[str, None]], username: str,
+                         obj_id: str, is_admin: bool):
+        """Add or drop obj_id from a user's admin index entry"""
+        if is_admin:
+            index.setdefault(username, {})[obj_id] = None
+        elif username in index:
+            index[username].pop(obj_id, None)
     
     def _ensure_db(self):
         """Lazy DB initialization - called on first DB operation"""
@@ -114,6 +155,7 @@ class DataStore:
             self.notes_col = db['shared_notes']
             self.settings_col = db['chat_settings']
             self.bots_col = db['bots']
+            self.bots_col.create_index('developer')
             print("✅ DB ready", flush=True)
     
     
@@ -201,6 +243,30 @@ class DataStore:
                 self.users[username][k] = v
             return True
     
+    def update_password_if_matches(self, username: str, expected_seed_hash: str,
+                                   new_password_hash: str, new_seed_hash: str = None) -> bool:
+        """
+        Set a new password hash only if the stored seed_hash is still the one
+        the caller verified against - one conditional write, no re-read.
+        Optionally rewrites the seed hash too (legacy format upgrade).
+        """
+        update_data = {'password': new_password_hash}
+        if new_seed_hash:
+            update_data['seed_hash'] = new_seed_hash
+        
+        if USE_MONGODB:
+            result = self.users_col.update_one(
+                {'username': username, 'seed_hash': expected_seed_hash},
+                {'$set': update_data}
+            )
+            return result.matched_count > 0
+        else:
+            user = self.users.get(username)
+            if not user or user.get('seed_hash') != expected_seed_hash:
+                return False
+            user.update(update_data)
+            return True
+    
     def update_user_preferences(self, username: str, prefs: dict) -> bool:
         """Update user's premium preferences (theme, font, message style)"""
         if USE_MONGODB:
@@ -257,6 +323,36 @@ class DataStore:
         """Call this when users are added/deleted"""
         self._username_cache = None
     
+    def is_user_premium(self, username: str) -> bool:
+        """
+        Premium status with a short TTL cache in Mongo mode - it is read on
+        every bot store hit, but only changes through set_user_premium()
+        """
+        if not USE_MONGODB:
+            user = self.users.get(username)
+            return bool(user and user.get('premium'))
+        
+        current_time = time.time()
+        cached = self._premium_cache.get(username)
+        if cached and cached[1] > current_time:
+            return cached[0]
+        
+        self._ensure_db()
+        user = self.users_col.find_one({'username': username}, {'premium': 1, '_id': 0})
+        is_premium = bool(user and user.get('premium'))
+        
+        # Every entry gets the same TTL, so insertion order is expiry order:
+        # drop expired entries from the front, then re-insert this one at the back
+        cache = self._premium_cache
+        while cache:
+            oldest = next(iter(cache))
+            if cache[oldest][1] > current_time:
+                break
+            del cache[oldest]
+        cache.pop(username, None)
+        cache[username] = (is_premium, current_time + self._cache_ttl)
+        return is_premium
+    
     @timed_db_op
     def search_users(self, query: str, exclude_username: str, limit: int = 20) -> List[dict]:
         """Search users by username - optimized single query"""
@@ -355,19 +451,16 @@ class DataStore:
     
     def change_user_password(self, username: str, current_password: str, new_password: str) -> bool:
         """Change password - expects plain text passwords, handles hashing"""
-        import hashlib
         user = self.get_user(username)
         if not user:
             return False
         
-        # Hash the current password and compare
-        current_hash = hashlib.sha256(current_password.encode()).hexdigest()
-        if user.get('password') != current_hash:
+        # Verify the current password (constant-time, accepts legacy hex hashes)
+        if not verify_password(current_password, user.get('password') or ''):
             return False
         
         # Hash the new password before storing
-        new_hash = hashlib.sha256(new_password.encode()).hexdigest()
-        return self.update_user_profile(username, {'password': new_hash})
+        return self.update_user_profile(username, {'password': hash_password(new_password)})
     
     def set_user_public_key(self, username: str, public_key: str):
         self.update_user_profile(username, {'public_key': public_key})
@@ -466,6 +559,31 @@ class DataStore:
         
         return message
     
+    def add_messages_bulk(self, items: List[Tuple[str, dict]]) -> List[dict]:
+        """
+        Add many (room_id, message) pairs in one write -
+        a single insert_many instead of a round trip per message
+        """
+        messages = []
+        for room_id, message in items:
+            message['id'] = self.generate_id()
+            message['room_id'] = room_id
+            messages.append(message)
+        
+        if not messages:
+            return messages
+        
+        if USE_MONGODB:
+            self.messages_col.insert_many(messages)
+        else:
+            for message in messages:
+                room_id = message['room_id']
+                if room_id not in self.messages:
+                    self.messages[room_id] = []
+                self.messages[room_id].append(message)
+        
+        return messages
+    
     @timed_db_op
     def get_messages(self, room_id: str) -> List[dict]:
         if USE_MONGODB:
@@ -619,8 +737,6 @@ class DataStore:
     
     def create_shared_note(self, room_id: str, title: str, content: str,
                           created_by: str, creator_phrase: str) -> dict:
-        import hashlib
-        
         note = {
             'id': self.generate_id(),
             'room_id': room_id,
@@ -628,7 +744,7 @@ class DataStore:
             'content': content,
             'created_by': created_by,
             'created_at': self.now(),
-            'member_phrases': {created_by: hashlib.sha256(creator_phrase.encode()).hexdigest()},
+            'member_phrases': {created_by: _phrase_hash(creator_phrase)},
             'pending_members': []
         }
         
@@ -652,8 +768,7 @@ class DataStore:
             return self.shared_notes.get(note_id)
     
     def set_note_phrase(self, note_id: str, username: str, phrase: str) -> bool:
-        import hashlib
-        hashed = hashlib.sha256(phrase.encode()).hexdigest()
+        hashed = _phrase_hash(phrase)
         
         if USE_MONGODB:
             result = self.notes_col.update_one(
@@ -671,12 +786,11 @@ class DataStore:
             return True
     
     def verify_note_phrase(self, note_id: str, username: str, phrase: str) -> Optional[str]:
-        import hashlib
         note = self.get_shared_note(note_id)
         if not note or username not in note.get('member_phrases', {}):
             return None
         
-        hashed = hashlib.sha256(phrase.encode()).hexdigest()
+        hashed = _phrase_hash(phrase)
         if hashed == note['member_phrases'][username]:
             return note['content']
         return None
@@ -744,6 +858,9 @@ class DataStore:
             self.groups_col.insert_one(group)
         else:
             self.groups[group['id']] = group
+            for member in group['members']:
+                self._user_groups.setdefault(member, {})[group['id']] = None
+            self._set_admin_index(self._user_admin_groups, owner, group['id'], True)
         
         return group
     
@@ -758,68 +875,92 @@ class DataStore:
             groups = list(self.groups_col.find({'members': username}, {'_id': 0}))
             return sorted(groups, key=lambda g: g.get('last_message_time') or g['created_at'], reverse=True)
         else:
-            groups = [g for g in self.groups.values() if username in g['members']]
+            # Membership index - no scan of every group's member list
+            group_ids = self._user_groups.get(username, ())
+            groups = [g for g in map(self.groups.get, group_ids) if g is not None]
             return sorted(groups, key=lambda g: g.get('last_message_time') or g['created_at'], reverse=True)
     
     def get_admin_channels(self, username: str) -> List[dict]:
-        """Get channels where user is creator or admin"""
+        """Get channels where user is owner or admin"""
         if USE_MONGODB:
             channels = list(self.channels_col.find({
                 '$or': [
-                    {'creator': username},
-                    {'admins': username}
+                    {'owner': username},
+                    {f'members.{username}': self.ROLE_ADMIN}
                 ]
             }, {'_id': 0}))
             return channels
         else:
-            return [c for c in self.channels.values() 
-                    if c.get('creator') == username or username in c.get('admins', [])]
+            # Same admin index as get_user_admin_channels, without the cap
+            channel_ids = self._user_admin_channels.get(username, ())
+            return [c for c in map(self.channels.get, channel_ids) if c is not None]
     
-    def add_bot_to_group_simple(self, group_id: str, bot_id: str) -> bool:
-        """Add a bot to a group"""
+    def add_bot_to_group_if_admin(self, group_id: str, bot_id: str,
+                                  username: str) -> Tuple[bool, Optional[str]]:
+        """
+        Add a bot to a group the user owns/administers - one store call.
+        Returns (True, None) or (False, 'not_found' | 'forbidden' | 'exists').
+        """
         if USE_MONGODB:
-            # Check if bot already exists
-            group = self.groups_col.find_one({'id': group_id}, {'bots': 1})
-            if group and 'bots' in group and bot_id in group['bots']:
-                return False
-            
             result = self.groups_col.update_one(
-                {'id': group_id},
-                {'$addToSet': {'bots': bot_id}}
+                {'id': group_id,
+                 '$or': [{'owner': username}, {'admins': username}],
+                 'bots': {'$ne': bot_id}},
+                {'$push': {'bots': bot_id}}
             )
-            return result.matched_count > 0
-        else:
-            if group_id not in self.groups:
-                return False
-            if 'bots' not in self.groups[group_id]:
-                self.groups[group_id]['bots'] = []
-            if bot_id in self.groups[group_id]['bots']:
-                return False
-            self.groups[group_id]['bots'].append(bot_id)
-            return True
-    
-    def add_bot_to_channel_simple(self, channel_id: str, bot_id: str) -> bool:
-        """Add a bot to a channel"""
+            if result.modified_count > 0:
+                return True, None
+            # Only the failure path pays for a read to say why
+            group = self.groups_col.find_one({'id': group_id}, {'owner': 1, 'admins': 1})
+            if not group:
+                return False, 'not_found'
+            if username != group.get('owner') and username not in group.get('admins', []):
+                return False, 'forbidden'
+            return False, 'exists'
+        else:
+            group = self.groups.get(group_id)
+            if group is None:
+                return False, 'not_found'
+            if username != group.get('owner') and username not in group.get('admins', ()):
+                return False, 'forbidden'
+            bots = group.setdefault('bots', [])
+            if bot_id in bots:
+                return False, 'exists'
+            bots.append(bot_id)
+            return True, None
+    
+    def add_bot_to_channel_if_admin(self, channel_id: str, bot_id: str,
+                                    username: str) -> Tuple[bool, Optional[str]]:
+        """
+        Add a bot to a channel the user owns or is an admin member of - one store call.
+        Returns (True, None) or (False, 'not_found' | 'forbidden' | 'exists').
+        """
         if USE_MONGODB:
-            # Check if bot already exists
-            channel = self.channels_col.find_one({'id': channel_id}, {'bots': 1})
-            if channel and 'bots' in channel and bot_id in channel['bots']:
-                return False
-            
             result = self.channels_col.update_one(
-                {'id': channel_id},
-                {'$addToSet': {'bots': bot_id}}
+                {'id': channel_id,
+                 '$or': [{'owner': username}, {f'members.{username}': self.ROLE_ADMIN}],
+                 'bots': {'$ne': bot_id}},
+                {'$push': {'bots': bot_id}}
             )
-            return result.matched_count > 0
+            if result.modified_count > 0:
+                return True, None
+            channel = self.channels_col.find_one({'id': channel_id}, {'owner': 1, 'members': 1})
         else:
-            if channel_id not in self.channels:
-                return False
-            if 'bots' not in self.channels[channel_id]:
-                self.channels[channel_id]['bots'] = []
-            if bot_id in self.channels[channel_id]['bots']:
-                return False
-            self.channels[channel_id]['bots'].append(bot_id)
-            return True
+            channel = self.channels.get(channel_id)
+        
+        if not channel:
+            return False, 'not_found'
+        if (username != channel.get('owner') and
+                channel.get('members', {}).get(username) != self.ROLE_ADMIN):
+            return False, 'forbidden'
+        if USE_MONGODB:
+            return False, 'exists'
+        
+        bots = channel.setdefault('bots', [])
+        if bot_id in bots:
+            return False, 'exists'
+        bots.append(bot_id)
+        return True, None
     
     def get_group_bots(self, group_id: str) -> List[str]:
         """Get bot IDs in a group"""
@@ -836,8 +977,10 @@ class DataStore:
             )
             return result.modified_count > 0
         else:
-            if group_id in self.groups and username not in self.groups[group_id]['members']:
+            user_groups = self._user_groups.setdefault(username, {})
+            if group_id in self.groups and group_id not in user_groups:
                 self.groups[group_id]['members'].append(username)
+                user_groups[group_id] = None
                 return True
             return False
     
@@ -909,7 +1052,9 @@ class DataStore:
             self.channels_col.insert_one(channel)
         else:
             self.channels[channel['id']] = channel
+            self._set_admin_index(self._user_admin_channels, owner, channel['id'], True)
         
+        self.invalidate_discover_cache()
         return channel
     
     def _detect_channel_categories(self, name: str, description: str) -> list:
@@ -1000,6 +1145,8 @@ class DataStore:
                     ch['members'] = {ch['owner']: self.ROLE_ADMIN}
                 if username not in ch['members']:
                     ch['members'][username] = role or self.ROLE_VIEWER
+                    if role == self.ROLE_ADMIN:
+                        self._set_admin_index(self._user_admin_channels, username, channel_id, True)
                 return True
             return False
     
@@ -1024,6 +1171,7 @@ class DataStore:
                     ch['subscribers'].remove(username)
                 if username in ch.get('members', {}):
                     del ch['members'][username]
+                    self._set_admin_index(self._user_admin_channels, username, channel_id, False)
                 return True
             return False
     
@@ -1031,6 +1179,10 @@ class DataStore:
         channel = self.get_channel(channel_id)
         if not channel:
             return None
+        return self.role_in_channel(channel, username)
+    
+    def role_in_channel(self, channel: dict, username: str) -> Optional[str]:
+        """Role of a user in an already-fetched channel - no second lookup"""
         if username == channel['owner']:
             return self.ROLE_ADMIN
         return channel.get('members', {}).get(username)
@@ -1039,8 +1191,7 @@ class DataStore:
         return self.get_member_role(channel_id, username)
     
     def can_post_in_channel(self, channel_id: str, username: str) -> bool:
-        role = self.get_member_role(channel_id, username)
-        return role in [self.ROLE_ADMIN, self.ROLE_MODERATOR]
+        return self.get_member_role(channel_id, username) in self.POSTING_ROLES
     
     def can_manage_channel(self, channel_id: str, username: str) -> bool:
         return self.get_member_role(channel_id, username) == self.ROLE_ADMIN
@@ -1051,12 +1202,16 @@ class DataStore:
                 {'id': channel_id},
                 {'$set': {'discoverable': discoverable}}
             )
-            return result.modified_count > 0
+            updated = result.modified_count > 0
         else:
-            if channel_id in self.channels:
+            updated = channel_id in self.channels
+            if updated:
                 self.channels[channel_id]['discoverable'] = discoverable
-                return True
-            return False
+        
+        # Only after the write, so a concurrent read can't re-cache the old visibility
+        if updated:
+            self.invalidate_discover_cache()
+        return updated
     
     def increment_channel_views(self, channel_id: str, username: str = None):
         if USE_MONGODB:
@@ -1162,7 +1317,8 @@ class DataStore:
         query = query.lower().strip()
         
         if USE_MONGODB:
-            filter_q = {'name': {'$regex': query, '$options': 'i'}}
+            # Escaped: the query is a literal substring, not a user-supplied pattern
+            filter_q = {'name': {'$regex': re.escape(query), '$options': 'i'}}
             if discoverable_only:
                 filter_q['discoverable'] = True
             return list(self.channels_col.find(filter_q, {'_id': 0}).limit(limit))
@@ -1173,7 +1329,10 @@ class DataStore:
                     continue
                 if query in ch['name'].lower() or query in (ch.get('description') or '').lower():
                     results.append(ch)
-            return results[:limit]
+                    # Stop scanning once the page is full
+                    if len(results) >= limit:
+                        break
+            return results
     
     def get_trending_channels(self, period: str = 'daily', sort_by: str = 'likes', limit: int = 20) -> List[dict]:
         channels = self.get_discoverable_channels(limit=100)
@@ -1181,17 +1340,63 @@ class DataStore:
         channels.sort(key=lambda x: len(x.get('likes', [])), reverse=True)
         return channels[:limit]
     
+    # Discoverable channels ranked for the shared discover cache
+    DISCOVER_POOL = 200
+    
+    def _rank_discover_channels(self) -> dict:
+        """User-independent discover rankings, cached for _cache_ttl"""
+        current_time = time.time()
+        
+        # Return cached if valid
+        if self._discover_cache and (current_time - self._discover_cache_time) < self._cache_ttl:
+            return self._discover_cache
+        
+        generation = self._discover_cache_gen
+        channels = self.get_discoverable_channels(limit=self.DISCOVER_POOL)
+        rankings = {
+            'trending': channels,
+            'most_liked': sorted(channels, key=lambda x: len(x.get('likes', [])), reverse=True),
+            'most_viewed': sorted(channels, key=lambda x: x.get('views', 0), reverse=True),
+            'new': sorted(channels, key=lambda x: x.get('created', ''), reverse=True),
+        }
+        
+        # Update cache - unless a write invalidated it while we were reading
+        if generation == self._discover_cache_gen:
+            self._discover_cache = rankings
+            self._discover_cache_time = current_time
+        return rankings
+    
     @timed_db_op
     def get_discover_channels_rotated(self, username: str = None) -> dict:
-        channels = self.get_discoverable_channels(exclude_user=username, limit=50)
+        """
+        Discover lists for a user: the shared rankings minus channels the
+        user owns or subscribes to. Only this filter runs per user.
+        In Mongo mode subscriber lists in the cached rankings can lag by up
+        to _cache_ttl; new or hidden channels drop the cache at once.
+        """
+        rankings = self._rank_discover_channels()
+        
+        if username:
+            def visible(channels, n):
+                return [ch for ch in channels
+                        if ch['owner'] != username and username not in ch.get('subscribers', [])][:n]
+        else:
+            def visible(channels, n):
+                return channels[:n]
+        
         return {
-            'trending': channels[:10],
-            'most_liked': sorted(channels, key=lambda x: len(x.get('likes', [])), reverse=True)[:10],
-            'most_viewed': sorted(channels, key=lambda x: x.get('views', 0), reverse=True)[:10],
-            'new': sorted(channels, key=lambda x: x.get('created', ''), reverse=True)[:10],
-            'all': channels
+            'trending': visible(rankings['trending'], 10),
+            'most_liked': visible(rankings['most_liked'], 10),
+            'most_viewed': visible(rankings['most_viewed'], 10),
+            'new': visible(rankings['new'], 10),
+            'all': visible(rankings['trending'], 50)
         }
     
+    def invalidate_discover_cache(self):
+        """Call this after channels are added or change visibility"""
+        self._discover_cache = None
+        self._discover_cache_gen += 1
+    
     def get_all_categories(self) -> List[dict]:
         """Get all available interest categories"""
         return [
@@ -1221,22 +1426,23 @@ class DataStore:
         ]
         
         if USE_MONGODB:
-            # Use MongoDB text search for efficiency
+            # Use MongoDB text search for efficiency; match the query literally
+            query_re = re.escape(query_lower)
             exact_matches = list(self.channels_col.find(
-                {'discoverable': True, 'name': {'$regex': query_lower, '$options': 'i'}},
+                {'discoverable': True, 'name': {'$regex': query_re, '$options': 'i'}},
                 {'_id': 0}
             ).limit(limit))
             
             category_matches = list(self.channels_col.find(
-                {'discoverable': True, 'categories': {'$regex': query_lower, '$options': 'i'},
-                 'name': {'$not': {'$regex': query_lower, '$options': 'i'}}},
+                {'discoverable': True, 'categories': {'$regex': query_re, '$options': 'i'},
+                 'name': {'$not': {'$regex': query_re, '$options': 'i'}}},
                 {'_id': 0}
             ).limit(limit))
             
             suggestions = list(self.channels_col.find(
-                {'discoverable': True, 'description': {'$regex': query_lower, '$options': 'i'},
-                 'name': {'$not': {'$regex': query_lower, '$options': 'i'}},
-                 'categories': {'$not': {'$regex': query_lower, '$options': 'i'}}},
+                {'discoverable': True, 'description': {'$regex': query_re, '$options': 'i'},
+                 'name': {'$not': {'$regex': query_re, '$options': 'i'}},
+                 'categories': {'$not': {'$regex': query_re, '$options': 'i'}}},
                 {'_id': 0}
             ).limit(limit))
         else:
@@ -1297,6 +1503,8 @@ class DataStore:
         else:
             if channel_id in self.channels:
                 self.channels[channel_id]['members'][username] = role
+                self._set_admin_index(self._user_admin_channels, username, channel_id,
+                                      role == self.ROLE_ADMIN)
                 return True
             return False
     
@@ -1429,6 +1637,9 @@ class DataStore:
     BOT_STATUS_REJECTED = 'rejected'
     BOT_STATUS_SUSPENDED = 'suspended'
     
+    # Only the most recent reports are kept on the bot document
+    MAX_BOT_REPORTS = 100
+    
     def _init_verified_bots(self):
         """Initialize pre-verified official bots - OPTIMIZED with batch check"""
         now = self.now()  # Single timestamp for all bots
@@ -1488,7 +1699,7 @@ class DataStore:
                 self.bots_col.insert_many(new_bots)
             else:
                 for bot in new_bots:
-                    self.bots[bot['bot_id']] = bot
+                    self._save_bot(bot)
     
     def _save_bot(self, bot: dict):
         """Save a bot to storage"""
@@ -1500,6 +1711,7 @@ class DataStore:
             )
         else:
             self.bots[bot['bot_id']] = bot
+            self._bots_by_developer.setdefault(bot.get('developer'), {})[bot['bot_id']] = None
     
     def get_bot(self, bot_id: str) -> Optional[dict]:
         """Get a bot by ID"""
@@ -1544,9 +1756,8 @@ class DataStore:
     def get_featured_bots(self, limit: int = 6) -> List[dict]:
         """Get featured/popular bots"""
         bots = self.get_approved_bots()
-        # Sort by installs and rating
-        bots.sort(key=lambda x: (x.get('official', False), x.get('installs', 0), x.get('rating', 0)), reverse=True)
-        return bots[:limit]
+        # Top N by installs and rating - a bounded heap, not a sort of every approved bot
+        return heapq.nlargest(limit, bots, key=lambda x: (x.get('official', False), x.get('installs', 0), x.get('rating', 0)))
     
     def get_free_bots(self) -> List[dict]:
         """Get all free bots available to non-premium users"""
@@ -1610,15 +1821,9 @@ class DataStore:
         if bot['developer'] != by_user:
             return False
         
-        # Allowed fields to update
-        allowed_fields = [
-            'name', 'description', 'avatar', 'category', 'commands',
-            'webhook_url', 'website', 'privacy_policy', 'terms_of_service'
-        ]
-        
-        for field in allowed_fields:
-            if field in data:
-                bot[field] = data[field]
+        # Only touch allowed fields that were actually provided
+        for field in data.keys() & _BOT_UPDATABLE:
+            bot[field] = data[field]
         
         bot['updated_at'] = self.now()
         self._save_bot(bot)
@@ -1704,17 +1909,24 @@ class DataStore:
         if not bot or not group:
             return False
         
-        if group_id in bot.get('groups', []):
+        bot_has_group = group_id in bot.get('groups', ())
+        group_has_bot = bot_id in group.get('bots', ())
+        
+        # Nothing to undo - skip the writes (idempotent retries)
+        if not bot_has_group and not group_has_bot:
+            return True
+        
+        if bot_has_group:
             bot['groups'].remove(group_id)
             self._save_bot(bot)
         
-        if USE_MONGODB:
-            self.groups_col.update_one(
-                {'id': group_id},
-                {'$pull': {'bots': bot_id}}
-            )
-        else:
-            if bot_id in group.get('bots', []):
+        if group_has_bot:
+            if USE_MONGODB:
+                self.groups_col.update_one(
+                    {'id': group_id},
+                    {'$pull': {'bots': bot_id}}
+                )
+            else:
                 group['bots'].remove(bot_id)
         
         return True
@@ -1759,7 +1971,7 @@ class DataStore:
             return []
         
         bot_ids = group.get('bots', [])
-        return [self.get_bot(bid) for bid in bot_ids if self.get_bot(bid)]
+        return [b for b in map(self.get_bot, bot_ids) if b is not None]
     
     def get_channel_bots(self, channel_id: str) -> List[dict]:
         """Get all bots in a channel"""
@@ -1768,7 +1980,7 @@ class DataStore:
             return []
         
         bot_ids = channel.get('bots', [])
-        return [self.get_bot(bid) for bid in bot_ids if self.get_bot(bid)]
+        return [b for b in map(self.get_bot, bot_ids) if b is not None]
     
     def rate_bot(self, bot_id: str, username: str, rating: int, review: str = None) -> bool:
         """Rate a bot (1-5 stars)"""
@@ -1802,15 +2014,26 @@ class DataStore:
         if not bot:
             return False
         
-        reports = bot.get('reports', [])
-        reports.append({
+        report = {
             'reporter': reporter,
             'reason': reason,
             'created_at': self.now()
-        })
+        }
         
-        bot['reports'] = reports
-        self._save_bot(bot)
+        if USE_MONGODB:
+            # Atomic bounded push - the document never grows past MAX_BOT_REPORTS
+            self.bots_col.update_one(
+                {'bot_id': bot_id},
+                {
+                    '$push': {'reports': {'$each': [report], '$slice': -self.MAX_BOT_REPORTS}},
+                    '$inc': {'reports_count': 1}
+                }
+            )
+        else:
+            reports = bot.get('reports', [])
+            reports.append(report)
+            bot['reports'] = reports[-self.MAX_BOT_REPORTS:]
+            bot['reports_count'] = bot.get('reports_count', len(reports) - 1) + 1
         return True
     
     def verify_bot_api_key(self, bot_id: str, api_key: str) -> bool:
@@ -1909,8 +2132,9 @@ class DataStore:
                 {'_id': 0}
             ).limit(20))
         else:
-            return [g for g in self.groups.values()
-                    if g.get('owner') == username or username in g.get('admins', [])][:20]
+            # Indexed lookup - O(user's admin groups) instead of a scan of every group
+            group_ids = self._user_admin_groups.get(username, ())
+            return [g for g in map(self.groups.get, group_ids) if g is not None][:20]
     
     def get_user_admin_channels(self, username: str) -> List[dict]:
         """Get channels where user is admin - OPTIMIZED: single query"""
@@ -1923,28 +2147,36 @@ class DataStore:
                 {'_id': 0}
             ).limit(20))
         else:
-            return [c for c in self.channels.values()
-                    if c.get('owner') == username or 
-                    c.get('members', {}).get(username) == self.ROLE_ADMIN][:20]
+            # Indexed lookup - O(user's admin channels) instead of a scan of every channel
+            channel_ids = self._user_admin_channels.get(username, ())
+            return [c for c in map(self.channels.get, channel_ids) if c is not None][:20]
     
     def get_bots_by_developer(self, developer: str) -> List[dict]:
         """Get bots created by a specific developer - OPTIMIZED: direct query"""
+        # Seed bots go through _save_bot, so this also warms the developer index
+        self._ensure_bots_initialized()
         if USE_MONGODB:
             return list(self.bots_col.find({'developer': developer}, {'_id': 0}))
         else:
-            return [b for b in self.bots.values() if b.get('developer') == developer]
+            # Developer index - no scan of the whole bot table
+            bot_ids = self._bots_by_developer.get(developer, ())
+            return [b for b in map(self.bots.get, bot_ids) if b is not None]
     
     def get_bots_grouped_by_status(self) -> dict:
         """Get bots grouped by status - OPTIMIZED: single aggregation"""
         if USE_MONGODB:
-            # Use aggregation to group in database
+            # Use aggregation to group in database; _id is projected away per facet
+            no_id = {'$project': {'_id': 0}}
             pipeline = [
                 {'$facet': {
-                    'pending': [{'$match': {'status': self.BOT_STATUS_PENDING}}],
-                    'approved': [{'$match': {'status': self.BOT_STATUS_APPROVED}}],
-                    'rejected': [{'$match': {'status': self.BOT_STATUS_REJECTED}}],
-                    'suspended': [{'$match': {'status': self.BOT_STATUS_SUSPENDED}}],
-                    'reported': [{'$match': {'reports.0': {'$exists': True}}}],
+                    'pending': [{'$match': {'status': self.BOT_STATUS_PENDING}}, no_id],
+                    'approved': [{'$match': {'status': self.BOT_STATUS_APPROVED}}, no_id],
+                    'rejected': [{'$match': {'status': self.BOT_STATUS_REJECTED}}, no_id],
+                    'suspended': [{'$match': {'status': self.BOT_STATUS_SUSPENDED}}, no_id],
+                    'reported': [{'$match': {'$or': [
+                        {'reports_count': {'$gt': 0}},
+                        {'reports.0': {'$exists': True}}  # Bots reported before reports_count existed
+                    ]}}, no_id],
                     'total': [{'$count': 'count'}]
                 }}
             ]
@@ -1952,23 +2184,38 @@ class DataStore:
             if result:
                 r = result[0]
                 return {
-                    'pending': [{k: v for k, v in b.items() if k != '_id'} for b in r.get('pending', [])],
-                    'approved': [{k: v for k, v in b.items() if k != '_id'} for b in r.get('approved', [])],
-                    'rejected': [{k: v for k, v in b.items() if k != '_id'} for b in r.get('rejected', [])],
-                    'suspended': [{k: v for k, v in b.items() if k != '_id'} for b in r.get('suspended', [])],
-                    'reported': [{k: v for k, v in b.items() if k != '_id'} for b in r.get('reported', [])],
+                    'pending': r.get('pending', []),
+                    'approved': r.get('approved', []),
+                    'rejected': r.get('rejected', []),
+                    'suspended': r.get('suspended', []),
+                    'reported': r.get('reported', []),
                     'total': r.get('total', [{}])[0].get('count', 0)
                 }
             return {'pending': [], 'approved': [], 'rejected': [], 'suspended': [], 'reported': [], 'total': 0}
         else:
-            bots = list(self.bots.values())
+            # One pass over the bot table instead of one per status
+            grouped = {
+                self.BOT_STATUS_PENDING: [],
+                self.BOT_STATUS_APPROVED: [],
+                self.BOT_STATUS_REJECTED: [],
+                self.BOT_STATUS_SUSPENDED: [],
+            }
+            reported = []
+            total = 0
+            for b in self.bots.values():
+                total += 1
+                status_bots = grouped.get(b.get('status'))
+                if status_bots is not None:
+                    status_bots.append(b)
+                if b.get('reports_count') or b.get('reports'):
+                    reported.append(b)
             return {
-                'pending': [b for b in bots if b.get('status') == self.BOT_STATUS_PENDING],
-                'approved': [b for b in bots if b.get('status') == self.BOT_STATUS_APPROVED],
-                'rejected': [b for b in bots if b.get('status') == self.BOT_STATUS_REJECTED],
-                'suspended': [b for b in bots if b.get('status') == self.BOT_STATUS_SUSPENDED],
-                'reported': [b for b in bots if len(b.get('reports', [])) > 0],
-                'total': len(bots)
+                'pending': grouped[self.BOT_STATUS_PENDING],
+                'approved': grouped[self.BOT_STATUS_APPROVED],
+                'rejected': grouped[self.BOT_STATUS_REJECTED],
+                'suspended': grouped[self.BOT_STATUS_SUSPENDED],
+                'reported': reported,
+                'total': total
             }
     
     def set_user_premium(self, username: str, is_premium: bool) -> bool:
@@ -1985,6 +2232,7 @@ class DataStore:
                 {'username': username},
                 {'$set': {'premium': is_premium, 'premium_updated_at': user['premium_updated_at']}}
             )
+            self._premium_cache.pop(username, None)
         
         return True
     
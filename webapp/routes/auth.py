@@ -1,74 +1,160 @@
 """
 🔐 Authentication Routes - SECURE
 Handles user registration, login, logout, and account recovery.
-All passwords are hashed with SHA-256.
+All passwords and seed phrases are hashed with salted PBKDF2-HMAC-SHA256.
 """
 
-from flask import Blueprint, render_template, request, session, redirect, url_for, jsonify
+from flask import Blueprint, render_template, request, session, redirect, url_for, jsonify, make_response
 from webapp.models import store
 from webapp.config import Config
+from webapp.wordlist import WORDLIST
+from webapp.utils.passwords import (
+    needs_rehash, hash_password, verify_password, hash_seed_phrase, verify_seed_phrase
+)
+import re
 import secrets
-import hashlib
+import time
+from collections import OrderedDict, deque
+from os import urandom
+from typing import Deque, Dict, Optional, Tuple
+from functools import lru_cache
 
 auth_bp = Blueprint('auth', __name__)
 
+# Validation limits and messages - fixed once config is loaded
+_MIN_USER = Config.MIN_USERNAME_LENGTH
+_MIN_PASS = Config.MIN_PASSWORD_LENGTH
+_ERR_USER = f"Username must be at least {_MIN_USER} characters"
+_ERR_PASS = f"Password must be at least {_MIN_PASS} characters"
 
-def hash_password(password: str) -> str:
-    """Securely hash a password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against its hash"""
-    return hash_password(password) == hashed
-
-
-# BIP39 wordlist (simplified - 256 common words for seed phrases)
-WORDLIST = [
-    "abandon", "ability", "able", "about", "above", "absent", "absorb", "abstract",
-    "absurd", "abuse", "access", "accident", "account", "accuse", "achieve", "acid",
-    "acoustic", "acquire", "across", "act", "action", "actor", "actress", "actual",
-    "adapt", "add", "addict", "address", "adjust", "admit", "adult", "advance",
-    "advice", "aerobic", "affair", "afford", "afraid", "again", "age", "agent",
-    "agree", "ahead", "aim", "air", "airport", "aisle", "alarm", "album",
-    "alcohol", "alert", "alien", "all", "alley", "allow", "almost", "alone",
-    "alpha", "already", "also", "alter", "always", "amateur", "amazing", "among",
-    "amount", "amused", "analyst", "anchor", "ancient", "anger", "angle", "angry",
-    "animal", "ankle", "announce", "annual", "another", "answer", "antenna", "antique",
-    "anxiety", "any", "apart", "apology", "appear", "apple", "approve", "april",
-    "arch", "arctic", "area", "arena", "argue", "arm", "armed", "armor",
-    "army", "around", "arrange", "arrest", "arrive", "arrow", "art", "artefact",
-    "artist", "artwork", "ask", "aspect", "assault", "asset", "assist", "assume",
-    "asthma", "athlete", "atom", "attack", "attend", "attitude", "attract", "auction",
-    "audit", "august", "aunt", "author", "auto", "autumn", "average", "avocado",
-    "avoid", "awake", "aware", "away", "awesome", "awful", "awkward", "axis",
-    "baby", "bachelor", "bacon", "badge", "bag", "balance", "balcony", "ball",
-    "bamboo", "banana", "banner", "bar", "barely", "bargain", "barrel", "base",
-    "basic", "basket", "battle", "beach", "bean", "beauty", "because", "become",
-    "beef", "before", "begin", "behave", "behind", "believe", "below", "belt",
-    "bench", "benefit", "best", "betray", "better", "between", "beyond", "bicycle",
-    "bid", "bike", "bind", "biology", "bird", "birth", "bitter", "black",
-    "blade", "blame", "blanket", "blast", "bleak", "bless", "blind", "blood",
-    "blossom", "blouse", "blue", "blur", "blush", "board", "boat", "body",
-    "boil", "bomb", "bone", "bonus", "book", "boost", "border", "boring",
-    "borrow", "boss", "bottom", "bounce", "box", "boy", "bracket", "brain",
-    "brand", "brass", "brave", "bread", "breeze", "brick", "bridge", "brief",
-    "bright", "bring", "brisk", "broccoli", "broken", "bronze", "broom", "brother",
-    "brown", "brush", "bubble", "buddy", "budget", "buffalo", "build", "bulb",
-    "bulk", "bullet", "bundle", "bunker", "burden", "burger", "burst", "bus",
-    "business", "busy", "butter", "buyer", "buzz", "cabbage", "cabin", "cable"
-]
+# Rate limiting for the endpoints that hash - each attempt costs a PBKDF2 run
+_RATE_LIMIT = Config.AUTH_RATE_LIMIT
+_RATE_WINDOW = Config.AUTH_RATE_WINDOW
+_RATE_LIMITED = frozenset({
+    'auth.register', 'auth.login', 'auth.recover',
+    'auth.api_register', 'auth.api_login', 'auth.api_recover',
+})
+_RATE_MAX_KEYS = 10000
+
+# "<client ip>:<endpoint>" -> monotonic times of recent attempts,
+# least recently used key first so eviction is a single popitem
+_auth_attempts: Dict[str, Deque[float]] = OrderedDict()
+
+# One-time id -> (seed phrase, expiry) for the page shown after registration.
+# Held server-side so the plaintext never rides in the signed-but-unencrypted
+# session cookie; constant TTL keeps the oldest entries first for pruning
+_SEED_PHRASE_TTL = 300  # seconds
+_pending_seed_phrases: Dict[str, Tuple[str, float]] = OrderedDict()
+
+# Fields the JSON recovery endpoint cannot do without
+_RECOVER_FIELDS = frozenset({'username', 'seed_phrase', 'new_password'})
+
+# Any run of whitespace in a typed/pasted seed phrase
+_WS_RE = re.compile(r'\s+')
 
 
 def generate_seed_phrase():
     """Generate a 12-word recovery seed phrase"""
-    words = [secrets.choice(WORDLIST) for _ in range(12)]
-    return ' '.join(words)
+    # One urandom read; 256 words means each byte indexes a word with no bias
+    return ' '.join([WORDLIST[b] for b in urandom(12)])
+
+
+def normalize_seed_phrase(raw: str) -> str:
+    """Collapse whitespace runs to single spaces, strip and lowercase"""
+    return _WS_RE.sub(' ', raw).strip().lower()
+
+
+def _client_ip() -> str:
+    """Client address - ProxyFix has already resolved trusted proxy hops"""
+    return request.remote_addr or ''
+
+
+@auth_bp.before_request
+def _rate_limit_auth():
+    """Cap hashing attempts per client IP before any password work happens"""
+    if request.method != 'POST' or request.endpoint not in _RATE_LIMITED:
+        return None
+    
+    now = time.monotonic()
+    
+    key = f"{_client_ip()}:{request.endpoint}"
+    attempts = _auth_attempts.get(key)
+    if attempts is None:
+        attempts = _auth_attempts[key] = deque()
+        # Evict the least recently seen client so many IPs can't grow this forever
+        if len(_auth_attempts) > _RATE_MAX_KEYS:
+            _auth_attempts.popitem(last=False)
+    else:
+        _auth_attempts.move_to_end(key)
+    
+    while attempts and now - attempts[0] >= _RATE_WINDOW:
+        attempts.popleft()
+    
+    if len(attempts) >= _RATE_LIMIT:
+        retry_after = int(_RATE_WINDOW - (now - attempts[0])) + 1
+        message = "Too many attempts. Please wait a minute and try again."
+        if request.path.startswith('/api/'):
+            response = jsonify({'success': False, 'message': message})
+        else:
+            # auth.login -> login.html etc.
+            response = render_template(f"{request.endpoint.split('.', 1)[1]}.html", error=message)
+        return response, 429, {'Retry-After': str(retry_after)}
+    
+    attempts.append(now)
+    return None
 
 
-def hash_seed_phrase(seed_phrase):
-    """Hash the seed phrase for storage"""
-    return hashlib.sha256(seed_phrase.encode()).hexdigest()
+@lru_cache(maxsize=None)
+def _render_form(template: str) -> str:
+    """
+    Render a blank auth form once and reuse the HTML.
+    GET /register, /login and /recover take no context, so the output
+    is identical for every visitor.
+    """
+    return render_template(template)
+
+
+def _validate_register(username: str, password: str,
+                       age_verified=True, terms_accepted=True) -> Optional[str]:
+    """
+    Validate registration input in one pass.
+    Returns the first error message, or None if the input is valid.
+    The mobile API collects age/terms consent in-app, so they default to True.
+    """
+    # Age verification (COPPA/GDPR compliance)
+    if not age_verified:
+        return "You must confirm you are 18 or older to use Menza"
+    if not terms_accepted:
+        return "You must accept the Terms of Service and Privacy Policy"
+    if len(username) < _MIN_USER:
+        return _ERR_USER
+    if len(password) < _MIN_PASS:
+        return _ERR_PASS
+    if store.user_exists(username):
+        return "Username already taken"
+    return None
+
+
+def _stash_seed_phrase(phrase: str) -> str:
+    """Hold a new seed phrase server-side; returns the one-time id for the session"""
+    now = time.monotonic()
+    while _pending_seed_phrases:
+        oldest = next(iter(_pending_seed_phrases))
+        if _pending_seed_phrases[oldest][1] > now:
+            break
+        del _pending_seed_phrases[oldest]
+    
+    phrase_id = secrets.token_urlsafe(16)
+    _pending_seed_phrases[phrase_id] = (phrase, now + _SEED_PHRASE_TTL)
+    return phrase_id
+
+
+def _claim_seed_phrase(phrase_id: Optional[str]) -> Optional[str]:
+    """Pop a stashed seed phrase - each id works once and only until it expires"""
+    entry = _pending_seed_phrases.pop(phrase_id, None) if phrase_id else None
+    if entry is None or entry[1] <= time.monotonic():
+        return None
+    return entry[0]
 
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
@@ -85,28 +171,9 @@ def register():
         age_verified = request.form.get('age_verified')
         terms_accepted = request.form.get('terms_accepted')
         
-        # Age verification (COPPA/GDPR compliance)
-        if not age_verified:
-            return render_template('register.html', 
-                error="You must confirm you are 18 or older to use Menza")
-        
-        # Terms acceptance
-        if not terms_accepted:
-            return render_template('register.html', 
-                error="You must accept the Terms of Service and Privacy Policy")
-        
-        # Basic validation
-        if len(username) < Config.MIN_USERNAME_LENGTH:
-            return render_template('register.html', 
-                error=f"Username must be at least {Config.MIN_USERNAME_LENGTH} characters")
-        
-        if len(password) < Config.MIN_PASSWORD_LENGTH:
-            return render_template('register.html', 
-                error=f"Password must be at least {Config.MIN_PASSWORD_LENGTH} characters")
-        
-        if store.user_exists(username):
-            return render_template('register.html', 
-                error="Username already taken")
+        error = _validate_register(username, password, age_verified, terms_accepted)
+        if error:
+            return render_template('register.html', error=error)
         
         # Generate seed phrase for account recovery
         seed_phrase = generate_seed_phrase()
@@ -124,21 +191,25 @@ def register():
         })
         
         session['username'] = username
-        session['show_seed_phrase'] = seed_phrase  # Show once after registration
+        session['seed_phrase_id'] = _stash_seed_phrase(seed_phrase)  # Show once after registration
         
+        # Redirect so a refresh re-GETs the phrase page instead of re-POSTing the form
         return redirect(url_for('auth.seed_phrase'))
     
-    return render_template('register.html')
+    return _render_form('register.html')
 
 
 @auth_bp.route('/seed-phrase')
 def seed_phrase():
     """Show the seed phrase once after registration"""
-    if 'username' not in session or 'show_seed_phrase' not in session:
+    phrase = _claim_seed_phrase(session.pop('seed_phrase_id', None))
+    if 'username' not in session or phrase is None:
         return redirect(url_for('auth.login'))
     
-    phrase = session.pop('show_seed_phrase')
-    return render_template('seed_phrase.html', seed_phrase=phrase)
+    # Claimed on first view; no-store keeps the page out of browser and proxy caches
+    response = make_response(render_template('seed_phrase.html', seed_phrase=phrase))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 
 @auth_bp.route('/recover', methods=['GET', 'POST'])
@@ -146,50 +217,47 @@ def recover():
     """Account recovery page using seed phrase"""
     if request.method == 'POST':
         username = request.form.get('username', '').strip().lower()
-        seed_phrase_raw = request.form.get('seed_phrase', '').strip().lower()
+        # Normalize seed phrase: collapse multiple spaces, strip, lowercase
+        seed_phrase = normalize_seed_phrase(request.form.get('seed_phrase', ''))
         new_password = request.form.get('new_password', '')
         
-        if not username or not seed_phrase_raw or not new_password:
+        if not username or not seed_phrase or not new_password:
             return render_template('recover.html', error="All fields are required")
         
-        # Normalize seed phrase: collapse multiple spaces, strip, lowercase
-        seed_words = seed_phrase_raw.split()
-        
         # Validate exactly 12 words
+        seed_words = seed_phrase.split(' ')
         if len(seed_words) != 12:
             return render_template('recover.html', 
                 error=f"Recovery phrase must be exactly 12 words (you entered {len(seed_words)})")
         
-        # Rejoin with single spaces for consistent hashing
-        seed_phrase = ' '.join(seed_words)
-        
-        if len(new_password) < Config.MIN_PASSWORD_LENGTH:
+        if len(new_password) < _MIN_PASS:
             return render_template('recover.html', 
-                error=f"Password must be at least {Config.MIN_PASSWORD_LENGTH} characters")
+                error=_ERR_PASS)
         
         user = store.get_user(username)
         if not user:
             return render_template('recover.html', error="Account not found")
         
         # Verify seed phrase
-        provided_hash = hash_seed_phrase(seed_phrase)
         stored_hash = user.get('seed_hash')
         
         if not stored_hash:
             return render_template('recover.html', 
                 error="This account was created before recovery phrases were enabled. Please contact support.")
         
-        if provided_hash != stored_hash:
+        if not verify_seed_phrase(seed_phrase, stored_hash):
             return render_template('recover.html', error="Invalid recovery phrase. Please check your words and try again.")
         
-        # Update password (hash it first - SECURITY)
-        hashed_new_password = hash_password(new_password)
-        store.update_user_profile(username, {'password': hashed_new_password})
+        # Update password (hash it first - SECURITY), only if the seed hash is unchanged
+        new_seed_hash = hash_seed_phrase(seed_phrase) if needs_rehash(stored_hash) else None
+        if not store.update_password_if_matches(username, stored_hash,
+                                                hash_password(new_password), new_seed_hash):
+            return render_template('recover.html', error="Invalid recovery phrase. Please check your words and try again.")
         
         return render_template('recover.html', 
             success="Password reset successfully! You can now log in with your new password.")
     
-    return render_template('recover.html')
+    return _render_form('recover.html')
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
@@ -205,13 +273,18 @@ def login():
             return render_template('login.html', error="Invalid credentials")
         
         # Verify hashed password (SECURITY)
-        if not verify_password(password, user.get('password', '')):
+        stored_password = user.get('password', '')
+        if not verify_password(password, stored_password):
             return render_template('login.html', error="Invalid credentials")
         
+        # Upgrade legacy hex hashes now that we have the plaintext
+        if needs_rehash(stored_password):
+            store.update_user_profile(username, {'password': hash_password(password)})
+        
         session['username'] = username
         return redirect(url_for('main.chat'))
     
-    return render_template('login.html')
+    return _render_form('login.html')
 
 
 @auth_bp.route('/logout')
@@ -228,8 +301,8 @@ def logout():
 @auth_bp.route('/api/auth/register', methods=['POST'])
 def api_register():
     """JSON API for mobile app registration"""
-    data = request.get_json()
-    if not data:
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
         return jsonify({'success': False, 'message': 'Invalid request data'}), 400
     
     username = data.get('username', '').strip().lower()
@@ -238,20 +311,9 @@ def api_register():
     phone = data.get('phone', '').strip() or None
     
     # Validation
-    if len(username) < Config.MIN_USERNAME_LENGTH:
-        return jsonify({
-            'success': False, 
-            'message': f'Username must be at least {Config.MIN_USERNAME_LENGTH} characters'
-        }), 400
-    
-    if len(password) < Config.MIN_PASSWORD_LENGTH:
-        return jsonify({
-            'success': False, 
-            'message': f'Password must be at least {Config.MIN_PASSWORD_LENGTH} characters'
-        }), 400
-    
-    if store.user_exists(username):
-        return jsonify({'success': False, 'message': 'Username already taken'}), 400
+    error = _validate_register(username, password)
+    if error:
+        return jsonify({'success': False, 'message': error}), 400
     
     # Generate seed phrase
     seed_phrase = generate_seed_phrase()
@@ -281,8 +343,8 @@ def api_register():
 @auth_bp.route('/api/auth/login', methods=['POST'])
 def api_login():
     """JSON API for mobile app login"""
-    data = request.get_json()
-    if not data:
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
         return jsonify({'success': False, 'message': 'Invalid request data'}), 400
     
     username = data.get('username', '').strip().lower()
@@ -293,9 +355,14 @@ def api_login():
     if not user:
         return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
     
-    if not verify_password(password, user.get('password', '')):
+    stored_password = user.get('password', '')
+    if not verify_password(password, stored_password):
         return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
     
+    # Upgrade legacy hex hashes now that we have the plaintext
+    if needs_rehash(stored_password):
+        store.update_user_profile(username, {'password': hash_password(password)})
+    
     session['username'] = username
     
     return jsonify({
@@ -340,26 +407,35 @@ def api_auth_status():
 @auth_bp.route('/api/auth/recover', methods=['POST'])
 def api_recover():
     """JSON API for account recovery"""
-    data = request.get_json()
-    if not data:
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
         return jsonify({'success': False, 'message': 'Invalid request data'}), 400
     
-    username = data.get('username', '').strip().lower()
-    seed_phrase_input = data.get('seed_phrase', '').strip().lower()
-    new_password = data.get('new_password', '')
+    # One set difference covers every missing field
+    if _RECOVER_FIELDS - data.keys():
+        return jsonify({'success': False, 'message': 'All fields are required'}), 400
+    
+    username = data['username'].strip().lower()
+    seed_phrase_input = normalize_seed_phrase(data['seed_phrase'])
+    new_password = data['new_password']
+    
+    if len(new_password) < _MIN_PASS:
+        return jsonify({'success': False, 'message': _ERR_PASS}), 400
     
     user = store.get_user(username)
     if not user:
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     # Verify seed phrase
-    input_hash = hash_seed_phrase(seed_phrase_input)
-    if input_hash != user.get('seed_hash'):
+    stored_hash = user.get('seed_hash') or ''
+    if not verify_seed_phrase(seed_phrase_input, stored_hash):
         return jsonify({'success': False, 'message': 'Invalid recovery phrase'}), 401
     
-    # Update password
-    new_hashed = hash_password(new_password)
-    store.update_user_profile(username, {'password': new_hashed})
+    # Update password, only if the seed hash is unchanged since it was verified
+    new_seed_hash = hash_seed_phrase(seed_phrase_input) if needs_rehash(stored_hash) else None
+    if not store.update_password_if_matches(username, stored_hash,
+                                            hash_password(new_password), new_seed_hash):
+        return jsonify({'success': False, 'message': 'Invalid recovery phrase'}), 401
     
     return jsonify({'success': True, 'message': 'Password reset successful'})
 
@@ -11,161 +11,152 @@ PREMIUM BOTS:
 - News Bot
 """
 
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, g, current_app
 from webapp.models import store
+from webapp.utils.bot_catalog import (
+    FREE_BOTS, PREMIUM_BOTS, ALL_BOTS, FREE_BOT_IDS,
+    COMMAND_HANDLERS, ARG_COMMANDS, process_bot_command
+)
+from functools import lru_cache, wraps
+from typing import Optional
 
 bots_bp = Blueprint('bots', __name__)
 
 
 # ============================================
-# BOT DEFINITIONS
+# BOT LISTINGS
 # ============================================
 
-FREE_BOTS = {
-    'coingecko': {
-        'id': 'coingecko',
-        'name': 'CoinGecko',
-        'description': 'Get real-time crypto prices',
-        'avatar': '🦎',
-        'commands': [
-            {'command': '/price', 'description': 'Get price', 'usage': '/price BTC'},
-            {'command': '/top', 'description': 'Top coins', 'usage': '/top 10'}
-        ],
-        'free': True
-    },
-    'phanes': {
-        'id': 'phanes',
-        'name': 'Phanes Trading',
-        'description': 'Trading signals and portfolio tracking',
-        'avatar': '🔮',
-        'commands': [
-            {'command': '/trade', 'description': 'Trade info', 'usage': '/trade BTC'},
-            {'command': '/balance', 'description': 'Check balance', 'usage': '/balance'}
-        ],
-        'free': True
-    }
-}
-
-PREMIUM_BOTS = {
-    'wallet_tracker': {
-        'id': 'wallet_tracker',
-        'name': 'Wallet Tracker',
-        'description': 'Track wallet addresses and transactions',
-        'avatar': '👛',
-        'commands': [
-            {'command': '/track', 'description': 'Track wallet', 'usage': '/track 0x...'},
-            {'command': '/txs', 'description': 'Recent transactions', 'usage': '/txs'}
-        ],
-        'free': False
-    },
-    'trading_bot': {
-        'id': 'trading_bot',
-        'name': 'Auto Trader',
-        'description': 'Automated trading strategies',
-        'avatar': '📈',
-        'commands': [
-            {'command': '/strategy', 'description': 'Set strategy', 'usage': '/strategy dca'},
-            {'command': '/pnl', 'description': 'Profit/Loss', 'usage': '/pnl'}
-        ],
-        'free': False
-    },
-    'news_bot': {
-        'id': 'news_bot',
-        'name': 'Crypto News',
-        'description': 'Latest crypto news and alerts',
-        'avatar': '📰',
-        'commands': [
-            {'command': '/news', 'description': 'Latest news', 'usage': '/news'},
-            {'command': '/alert', 'description': 'Set alert', 'usage': '/alert BTC 50000'}
-        ],
-        'free': False
-    }
-}
-
-ALL_BOTS = {**FREE_BOTS, **PREMIUM_BOTS}
+# The catalog never changes at runtime - build the listings once, as tuples
+# so a handler can't mutate what every request shares
+_FREE_BOTS = tuple(FREE_BOTS.values())
+_PREMIUM_BOTS = tuple(PREMIUM_BOTS.values())
+_ALL_BOTS = (*_FREE_BOTS, *_PREMIUM_BOTS)
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+def is_user_premium(username: str) -> bool:
+    """Premium status of the logged-in user - read from the store at most once per request"""
+    cached = g.get('_premium')
+    if cached is None:
+        cached = g._premium = store.is_user_premium(username)
+    return cached
+
+
+def _json_body(payload) -> bytes:
+    """
+    Encode a response body once for caching. Goes through the app's JSON
+    provider (orjson) and stores bytes, so cached hits skip both the
+    serialization and the str -> UTF-8 encode done per response.
+    """
+    return (current_app.json.dumps(payload) + '\n').encode()
+
+
+def can_access_bot(username: str, bot_id: str) -> bool:
+    """Free bots need no user lookup; premium catalog bots need premium"""
+    if bot_id in FREE_BOT_IDS:
+        return True
+    return bot_id in ALL_BOTS and is_user_premium(username)
+
+
+def require_bot_access(f):
+    """
+    Resolve <bot_id> once for a route: 404 for unknown bots, 403 for
+    premium bots without premium. The bot is passed on as g.bot.
+    """
+    @wraps(f)
+    def decorated_function(bot_id, *args, **kwargs):
+        bot = ALL_BOTS.get(bot_id)
+        if not bot:
+            return jsonify({'error': 'Bot not found'}), 404
+        
+        if not can_access_bot(g.username, bot_id):
+            return jsonify({
+                'error': 'Premium required',
+                'bot': {'id': bot['id'], 'name': bot['name']},
+                'upgrade_url': '/premium'
+            }), 403
+        
+        g.bot = bot
+        return f(bot_id, *args, **kwargs)
+    return decorated_function
 
 
 # ============================================
 # ROUTES
 # ============================================
 
+@bots_bp.before_request
+def _require_login():
+    """Every bot route needs a session - checked once here instead of per route"""
+    username = session.get('username')
+    if not username:
+        if request.path.startswith('/api/'):
+            return jsonify({'error': 'Not logged in'}), 401
+        return redirect(url_for('auth.login'))
+    
+    # Read the session once; routes use g.username
+    g.username = username
+
+
 @bots_bp.route('/bots')
 def bot_store():
     """Bot store page"""
-    if 'username' not in session:
-        return redirect(url_for('auth.login'))
-    
-    username = session['username']
-    user = store.get_user(username)
-    is_premium = user.get('premium', False) if user else False
+    is_premium = is_user_premium(g.username)
     
+    return _render_store(is_premium)
+
+
+@lru_cache(maxsize=2)
+def _render_store(is_premium: bool) -> str:
+    """
+    Render the bot store page once per tier.
+    The bot lists are static, so the page only varies by premium status.
+    """
     return render_template('bot_store_simple.html',
-                         username=username,
                          is_premium=is_premium,
-                         free_bots=list(FREE_BOTS.values()),
-                         premium_bots=list(PREMIUM_BOTS.values()))
+                         free_bots=_FREE_BOTS,
+                         premium_bots=_PREMIUM_BOTS)
 
 
 @bots_bp.route('/api/bots')
 def get_bots():
     """Get available bots"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    user = store.get_user(session['username'])
-    is_premium = user.get('premium', False) if user else False
-    
-    available = list(FREE_BOTS.values())
-    if is_premium:
-        available.extend(PREMIUM_BOTS.values())
-    
-    return jsonify({
-        'bots': available,
+    return current_app.response_class(_bots_payload(is_user_premium(g.username)),
+                                      mimetype='application/json')
+
+
+@lru_cache(maxsize=2)
+def _bots_payload(is_premium: bool) -> bytes:
+    """Encoded /api/bots body per tier - the bot lists are module constants"""
+    return _json_body({
+        'bots': _ALL_BOTS if is_premium else _FREE_BOTS,
         'is_premium': is_premium
     })
 
 
 @bots_bp.route('/api/bots/<bot_id>')
+@require_bot_access
 def get_bot(bot_id):
     """Get bot details"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    bot = ALL_BOTS.get(bot_id)
-    if not bot:
-        return jsonify({'error': 'Bot not found'}), 404
-    
-    user = store.get_user(session['username'])
-    is_premium = user.get('premium', False) if user else False
-    
-    # Check access
-    if not bot['free'] and not is_premium:
-        return jsonify({
-            'error': 'Premium required',
-            'bot': {'id': bot['id'], 'name': bot['name']},
-            'upgrade_url': '/premium'
-        }), 403
-    
-    return jsonify({'bot': bot})
+    return current_app.response_class(_bot_payload(bot_id), mimetype='application/json')
+
+
+@lru_cache(maxsize=None)
+def _bot_payload(bot_id: str) -> bytes:
+    """Encoded /api/bots/<bot_id> body - only ids in ALL_BOTS get here"""
+    return _json_body({'bot': ALL_BOTS[bot_id]})
 
 
 @bots_bp.route('/api/bots/<bot_id>/add', methods=['POST'])
+@require_bot_access
 def add_bot_to_chats(bot_id):
     """Add a bot to user's chat list"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    bot = ALL_BOTS.get(bot_id)
-    if not bot:
-        return jsonify({'error': 'Bot not found'}), 404
-    
-    username = session['username']
-    user = store.get_user(username)
-    is_premium = user.get('premium', False) if user else False
-    
-    # Check access for premium bots
-    if not bot['free'] and not is_premium:
-        return jsonify({'error': 'Premium required'}), 403
+    bot = g.bot
+    username = g.username
     
     # Add bot to user's bot list
     result = store.add_user_bot(username, bot_id)
@@ -189,10 +180,7 @@ def add_bot_to_chats(bot_id):
 @bots_bp.route('/api/bots/my')
 def get_my_bots():
     """Get user's added bots"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    username = session['username']
+    username = g.username
     user_bots = store.get_user_bots(username)
     
     # Get full bot info for each added bot
@@ -207,10 +195,7 @@ def get_my_bots():
 @bots_bp.route('/api/bots/<bot_id>/remove', methods=['POST'])
 def remove_bot_from_chats(bot_id):
     """Remove a bot from user's chat list"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    username = session['username']
+    username = g.username
     success = store.remove_user_bot(username, bot_id)
     
     if success:
@@ -222,10 +207,7 @@ def remove_bot_from_chats(bot_id):
 @bots_bp.route('/api/user/groups')
 def get_user_groups():
     """Get user's groups for bot management"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    username = session['username']
+    username = g.username
     groups = store.get_user_groups(username)
     
     return jsonify({'groups': groups})
@@ -234,163 +216,113 @@ def get_user_groups():
 @bots_bp.route('/api/user/channels')
 def get_user_channels():
     """Get channels where user is admin for bot management"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    username = session['username']
+    username = g.username
     channels = store.get_admin_channels(username)
     
     return jsonify({'channels': channels})
 
 
 @bots_bp.route('/api/bots/<bot_id>/add-to-group', methods=['POST'])
+@require_bot_access
 def add_bot_to_group(bot_id):
     """Add a bot to a group"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
+    bot = g.bot
+    username = g.username
     
-    bot = ALL_BOTS.get(bot_id)
-    if not bot:
-        return jsonify({'error': 'Bot not found'}), 404
-    
-    username = session['username']
-    user = store.get_user(username)
-    is_premium = user.get('premium', False) if user else False
-    
-    # Check access for premium bots
-    if not bot['free'] and not is_premium:
-        return jsonify({'error': 'Premium required'}), 403
-    
-    data = request.get_json()
-    if not data or 'group_id' not in data:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or 'group_id' not in data:
         return jsonify({'error': 'Group ID required'}), 400
     
-    group_id = data['group_id']
-    
-    # Check if user is admin/owner of the group
-    group = store.get_group(group_id)
-    if not group:
-        return jsonify({'error': 'Group not found'}), 404
-    
-    if username not in group.get('admins', []) and username != group.get('owner'):
-        return jsonify({'error': 'You must be an admin to add bots'}), 403
-    
-    # Add bot to group
-    success = store.add_bot_to_group_simple(group_id, bot_id)
+    # Existence, admin check and insert in one store call
+    success, error = store.add_bot_to_group_if_admin(data['group_id'], bot_id, username)
     if success:
         return jsonify({
             'success': True,
             'message': f'{bot["name"]} added to group'
         })
-    else:
-        return jsonify({'error': 'Bot already in group or error occurred'}), 400
+    if error == 'not_found':
+        return jsonify({'error': 'Group not found'}), 404
+    if error == 'forbidden':
+        return jsonify({'error': 'You must be an admin to add bots'}), 403
+    return jsonify({'error': 'Bot already in group or error occurred'}), 400
 
 
 @bots_bp.route('/api/bots/<bot_id>/add-to-channel', methods=['POST'])
+@require_bot_access
 def add_bot_to_channel(bot_id):
     """Add a bot to a channel"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    bot = ALL_BOTS.get(bot_id)
-    if not bot:
-        return jsonify({'error': 'Bot not found'}), 404
-    
-    username = session['username']
-    user = store.get_user(username)
-    is_premium = user.get('premium', False) if user else False
+    bot = g.bot
+    username = g.username
     
-    # Check access for premium bots
-    if not bot['free'] and not is_premium:
-        return jsonify({'error': 'Premium required'}), 403
-    
-    data = request.get_json()
-    if not data or 'channel_id' not in data:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or 'channel_id' not in data:
         return jsonify({'error': 'Channel ID required'}), 400
     
-    channel_id = data['channel_id']
-    
-    # Check if user is admin of the channel
-    channel = store.get_channel(channel_id)
-    if not channel:
-        return jsonify({'error': 'Channel not found'}), 404
-    
-    if username != channel.get('creator') and username not in channel.get('admins', []):
-        return jsonify({'error': 'You must be an admin to add bots'}), 403
-    
-    # Add bot to channel
-    success = store.add_bot_to_channel_simple(channel_id, bot_id)
+    # Existence, admin check and insert in one store call
+    success, error = store.add_bot_to_channel_if_admin(data['channel_id'], bot_id, username)
     if success:
         return jsonify({
             'success': True,
             'message': f'{bot["name"]} added to channel'
         })
-    else:
-        return jsonify({'error': 'Bot already in channel or error occurred'}), 400
+    if error == 'not_found':
+        return jsonify({'error': 'Channel not found'}), 404
+    if error == 'forbidden':
+        return jsonify({'error': 'You must be an admin to add bots'}), 403
+    return jsonify({'error': 'Bot already in channel or error occurred'}), 400
 
 
 @bots_bp.route('/api/bots/<bot_id>/command', methods=['POST'])
+@require_bot_access
 def run_command(bot_id):
     """Run a bot command"""
-    if 'username' not in session:
-        return jsonify({'error': 'Not logged in'}), 401
-    
-    bot = ALL_BOTS.get(bot_id)
-    if not bot:
-        return jsonify({'error': 'Bot not found'}), 404
-    
-    user = store.get_user(session['username'])
-    is_premium = user.get('premium', False) if user else False
-    
-    # Check access
-    if not bot['free'] and not is_premium:
-        return jsonify({'error': 'Premium required'}), 403
-    
-    data = request.get_json()
-    if not data:
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
         return jsonify({'error': 'Invalid request data'}), 400
     
     command = data.get('command', '')
     args = data.get('args', [])
     
-    # Process command
+    # Process command - known commands are cached, anything else is computed
+    key = _response_cache_key(bot_id, command, args)
+    if key is not None:
+        body = _cached_response(bot_id, command, key)
+        return current_app.response_class(body, mimetype='application/json')
+    
     response = process_bot_command(bot_id, command, args)
     return jsonify({'response': response})
 
 
-def process_bot_command(bot_id: str, command: str, args: list) -> str:
-    """Process a bot command and return response"""
-    
-    if bot_id == 'coingecko':
-        if command == '/price':
-            coin = args[0].upper() if args else 'BTC'
-            return f"💰 **{coin}** Price\n$45,230.50 (+2.3%)\n_Data from CoinGecko_"
-        elif command == '/top':
-            return "🏆 **Top Coins**\n1. BTC $45,230\n2. ETH $2,350\n3. SOL $98"
-        return "Use /price <coin> or /top"
-    
-    elif bot_id == 'phanes':
-        if command == '/trade':
-            return "📊 **Trade Signal**\nBTC/USD: BUY\nEntry: $45,000\nTarget: $48,000"
-        elif command == '/balance':
-            return "💰 **Portfolio**\nBTC: 0.5\nETH: 2.0\nTotal: $26,000"
-        return "Use /trade or /balance"
-    
-    elif bot_id == 'wallet_tracker':
-        if command == '/track':
-            return "👛 **Tracking Wallet**\nAddress added to watchlist"
-        return "Use /track <address>"
-    
-    elif bot_id == 'trading_bot':
-        if command == '/strategy':
-            return "📈 **Strategy Set**\nDCA mode activated"
-        elif command == '/pnl':
-            return "💹 **P&L Report**\n+$1,250 (+12.5%)"
-        return "Use /strategy or /pnl"
-    
-    elif bot_id == 'news_bot':
-        if command == '/news':
-            return "📰 **Latest News**\n• Bitcoin hits new high\n• ETH 2.0 update live"
-        return "Use /news"
-    
-    return "Unknown command"
+# Longest argument whose reply is cached - longer ones are computed every time
+_MAX_CACHED_ARG = 32
+
+
+def _response_cache_key(bot_id: str, command, args) -> Optional[tuple]:
+    """
+    The part of a command its reply depends on, or None if it isn't cacheable.
+    Keyed only on what the handler reads: the uppercased first arg for
+    ARG_COMMANDS, nothing for constant replies.
+    """
+    if not isinstance(command, str) or command not in COMMAND_HANDLERS.get(bot_id, ()):
+        return None
+    if (bot_id, command) not in ARG_COMMANDS:
+        return ()
+    if not isinstance(args, list):
+        return None
+    if not args:
+        return ()
+    arg = args[0]
+    if not isinstance(arg, str) or len(arg) > _MAX_CACHED_ARG:
+        return None
+    return (arg.upper(),)
+
+
+@lru_cache(maxsize=1024)
+def _cached_response(bot_id: str, command: str, args: tuple) -> bytes:
+    """
+    Bot responses are deterministic in (bot, command, args), so repeat
+    commands skip the handler and the encoding. args is the cache key from
+    _response_cache_key - str.upper() is idempotent, so re-uppercasing it
+    in the handler gives the same reply as the raw argument.
+    """
+    return _json_body({'response': process_bot_command(bot_id, command, list(args))})
@@ -31,12 +31,20 @@ def channels_page():
     filter_map = {'most_liked': 'most_liked', 'most_viewed': 'most_viewed', 'new': 'new'}
     discover_channels = discover_data.get(filter_map.get(discover_filter, 'trending'), [])[:20]
     
+    # Like state for the whole grid in one batch query - not a has_liked_channel per card
+    try:
+        liked_channel_ids = store.get_liked_channels_batch([c['id'] for c in discover_channels], username)
+    except Exception as e:
+        print(f"Channels page likes error: {e}", flush=True)
+        liked_channel_ids = set()
+    
     return render_template('channels.html',
                          username=username,
                          my_channels=my_channels,
                          subscribed_channels=subscribed,
                          discover_channels=discover_channels,
                          discover_filter=discover_filter,
+                         liked_channel_ids=liked_channel_ids,
                          trending_channels=discover_data.get('trending', [])[:5])
 
 
@@ -166,6 +174,8 @@ def view_channel(channel_id):
         
         username = session['username']
         is_owner = channel['owner'] == username
+        # Role comes from the channel already in hand - no refetch per permission check
+        user_role = store.role_in_channel(channel, username)
         posts = store.get_channel_posts(channel_id)
         my_channels = store.get_user_channels(username)
         subscribed = store.get_subscribed_channels(username)
@@ -176,8 +186,8 @@ def view_channel(channel_id):
                              username=username,
                              is_owner=is_owner,
                              is_subscribed=(username in channel.get('subscribers', [])),
-                             user_role=store.get_member_role(channel_id, username),
-                             can_post=store.can_post_in_channel(channel_id, username),
+                             user_role=user_role,
+                             can_post=user_role in store.POSTING_ROLES,
                              can_manage=is_owner,
                              members_with_roles=[],
                              my_channels=my_channels,
@@ -379,7 +389,7 @@ def api_get_channel(channel_id):
                 'is_verified': channel.get('verified', False),
                 'is_subscribed': username in channel.get('subscribers', []),
                 'is_owner': channel.get('owner') == username,
-                'can_post': store.can_post_in_channel(channel_id, username),
+                'can_post': store.role_in_channel(channel, username) in store.POSTING_ROLES,
                 'created_at': channel.get('created_at', ''),
                 'posts': [{
                     'id': p.get('id'),
@@ -460,7 +470,7 @@ def api_add_moderator(channel_id):
     if 'username' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
     
@@ -499,7 +509,7 @@ def api_remove_moderator(channel_id):
     if 'username' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
     
@@ -534,7 +544,7 @@ def api_create_channel():
     if 'username' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
     
@@ -582,7 +592,7 @@ def api_create_post(channel_id):
     if not store.can_post_in_channel(channel_id, username):
         return jsonify({'success': False, 'error': 'You do not have permission to post'}), 403
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
     
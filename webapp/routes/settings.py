@@ -6,6 +6,7 @@ User profile management, password changes, and account settings.
 
 from flask import Blueprint, render_template, request, session, redirect, url_for, jsonify
 from webapp.models import store
+from functools import lru_cache
 import hashlib
 import os
 
@@ -71,7 +72,7 @@ def change_password():
         return jsonify({'success': False, 'error': 'Not logged in'}), 401
     
     username = session['username']
-    data = request.get_json()
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
@@ -98,7 +99,7 @@ def update_reset_method():
         return jsonify({'success': False, 'error': 'Not logged in'}), 401
     
     username = session['username']
-    data = request.get_json()
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
@@ -123,7 +124,7 @@ def update_privacy():
         return jsonify({'success': False, 'error': 'Not logged in'}), 401
     
     username = session['username']
-    data = request.get_json()
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
@@ -176,7 +177,7 @@ def sync_contacts():
         return jsonify({'success': False, 'message': 'Not logged in'}), 401
     
     username = session['username']
-    data = request.get_json()
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'success': False, 'message': 'Invalid request data'}), 400
@@ -236,7 +237,7 @@ def find_contact():
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not logged in'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'success': False, 'message': 'Invalid request data'}), 400
@@ -271,6 +272,13 @@ def find_contact():
 @settings_bp.route('/premium')
 def premium_page():
     """Premium subscription page with all features"""
+    # premium.html is the same for every visitor - no user lookup needed
+    return _render_premium()
+
+
+@lru_cache(maxsize=1)
+def _render_premium() -> str:
+    """Render the premium page once - it only shows the static feature catalog"""
     from webapp.utils.premium_features import (
         PREMIUM_FONTS,
         FONT_CATEGORIES,
@@ -284,13 +292,7 @@ def premium_page():
         generate_google_fonts_url
     )
     
-    username = session.get('username')
-    user = store.get_user(username) if username else None
-    is_premium = user.get('premium', False) if user else False
-    
     return render_template('premium.html',
-                         username=username,
-                         is_premium=is_premium,
                          fonts=PREMIUM_FONTS,
                          font_categories=FONT_CATEGORIES,
                          live_emojis=LIVE_EMOJIS,
@@ -320,7 +322,7 @@ def set_theme():
     username = session['username']
     user = store.get_user(username)
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
     
@@ -352,7 +354,7 @@ def set_font():
     username = session['username']
     user = store.get_user(username)
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
     
@@ -384,7 +386,7 @@ def set_message_style():
     username = session['username']
     user = store.get_user(username)
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
     
@@ -439,7 +441,7 @@ def register_push_token():
     if 'username' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
     
@@ -463,7 +465,7 @@ def register_device():
     if 'username' not in session:
         return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({'success': False, 'error': 'Invalid request data'}), 400
     
@@ -174,8 +174,8 @@ def register_call_events(socketio):
                 return
             
             # Check if user can start call (must be admin or moderator)
-            user_role = store.get_user_channel_role(target_id, username)
-            if user_role not in ['admin', 'mod']:
+            user_role = store.role_in_channel(channel, username)
+            if user_role not in store.POSTING_ROLES:
                 emit('call_error', {'error': 'Only admins and moderators can start channel calls'})
                 return
             
@@ -214,11 +214,11 @@ def register_call_events(socketio):
                 'can_speak': True
             })
             
-            # Notify all channel subscribers
+            # Notify all channel subscribers - roles read from the channel already in hand
             for subscriber in channel.get('subscribers', []):
                 if subscriber != username:
-                    sub_role = store.get_user_channel_role(target_id, subscriber)
-                    can_speak = sub_role in ['admin', 'mod']
+                    sub_role = store.role_in_channel(channel, subscriber)
+                    can_speak = sub_role in store.POSTING_ROLES
                     
                     for sid, user in store.online_users.items():
                         if user == subscriber:
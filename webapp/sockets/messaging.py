@@ -243,25 +243,21 @@ def register_messaging_events(socketio):
     
     def process_group_bot_command(content, group_bots):
         """Process a bot command in a group context"""
-        from webapp.routes.bots import ALL_BOTS, process_bot_command
+        from webapp.utils.bot_catalog import ALL_BOTS, BOT_COMMANDS, process_bot_command
         
         parts = content.strip().split()
         command = parts[0] if parts else ''
         args = parts[1:] if len(parts) > 1 else []
         
-        # Check each bot in the group to see if it handles this command
+        # First bot in the group that handles this command (set lookup per bot)
         for bot_id in group_bots:
-            bot = ALL_BOTS.get(bot_id)
-            if bot:
-                # Check if this bot has this command
-                for cmd in bot.get('commands', []):
-                    if cmd['command'] == command:
-                        response = process_bot_command(bot_id, command, args)
-                        return {
-                            'bot_id': bot_id,
-                            'bot_name': f"🤖 {bot['name']}",
-                            'response': response
-                        }
+            if command in BOT_COMMANDS.get(bot_id, ()):
+                response = process_bot_command(bot_id, command, args)
+                return {
+                    'bot_id': bot_id,
+                    'bot_name': f"🤖 {ALL_BOTS[bot_id]['name']}",
+                    'response': response
+                }
         
         return None
     
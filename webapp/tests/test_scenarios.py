@@ -8,7 +8,8 @@ Tests every possible scenario for the 10 test users:
 - Channel subscriptions & posting
 - Bot interactions
 - Shared notes
-- Account recovery
+- Account recovery & password hashing
+- Auth rate limiting
 """
 
 import sys
@@ -256,6 +257,12 @@ def run_group_scenarios(test: TestScenarios):
     test.assert_true(group is not None, "Can find group by invite code")
     if group:
         test.assert_equal(group['name'], 'Mixed Community', "Correct group found")
+    
+    # Test 5.4: Store never drops groups (in-memory mode holds the only copy)
+    print("\n5.4 Groups are never evicted:")
+    created = [store.create_group(f'Retention Group {i}', 'henry_premium', ['ivy_premium'])['id']
+               for i in range(200)]
+    test.assert_true(all(store.get_group(gid) for gid in created), "Every created group still retrievable")
 
 
 def run_channel_scenarios(test: TestScenarios):
@@ -299,6 +306,21 @@ def run_channel_scenarios(test: TestScenarios):
     all_private = [c for c in store.get_all_channels() if not c.get('discoverable', True)]
     print(f"     Public channels: {len(all_public)}, Private channels: {len(all_private)}")
     test.assert_greater_than(len(all_private), 0, "Private channels exist")
+    
+    # Test 6.5: Admin channel lookup
+    print("\n6.5 Admin channel lookup:")
+    if all_channels:
+        channel = all_channels[0]
+        owner_admin_ids = [c['id'] for c in store.get_user_admin_channels(channel['owner'])]
+        test.assert_true(channel['id'] in owner_admin_ids, "Owner sees channel as admin")
+        picker_ids = [c['id'] for c in store.get_admin_channels(channel['owner'])]
+        test.assert_true(channel['id'] in picker_ids, "Owner's channel offered in bot picker")
+        store.set_member_role(channel['id'], 'eve_free', store.ROLE_ADMIN, channel['owner'])
+        eve_admin_ids = [c['id'] for c in store.get_user_admin_channels('eve_free')]
+        test.assert_true(channel['id'] in eve_admin_ids, "Promoted member sees channel as admin")
+        store.set_member_role(channel['id'], 'eve_free', store.ROLE_VIEWER, channel['owner'])
+        eve_admin_ids = [c['id'] for c in store.get_user_admin_channels('eve_free')]
+        test.assert_true(channel['id'] not in eve_admin_ids, "Demoted member no longer admin")
 
 
 def run_shared_notes_scenarios(test: TestScenarios):
@@ -375,6 +397,19 @@ def run_bot_scenarios(test: TestScenarios):
     print("\n8.4 Featured bots:")
     featured = store.get_featured_bots(limit=3)
     test.assert_greater_than(len(featured), 0, "Featured bots returned")
+    
+    # Test 8.5: Bot response cache keys
+    print("\n8.5 Bot response cache:")
+    from webapp.routes.bots import _response_cache_key
+    from webapp.utils.bot_catalog import process_bot_command
+    
+    key = _response_cache_key('coingecko', '/price', ['ẞtc', 'ignored'])
+    test.assert_equal(key, ('ẞTC',), "Price keyed on the uppercased first arg only")
+    test.assert_equal(process_bot_command('coingecko', '/price', list(key)),
+                      process_bot_command('coingecko', '/price', ['ẞtc']), "Cached reply matches uncached")
+    test.assert_equal(_response_cache_key('coingecko', '/top', ['x' * 10000]), (), "Constant reply ignores args")
+    test.assert_true(_response_cache_key('coingecko', '/price', ['x' * 10000]) is None, "Long argument not cached")
+    test.assert_true(_response_cache_key('coingecko', '/' + 'x' * 10000, []) is None, "Unknown command not cached")
 
 
 def run_search_scenarios(test: TestScenarios):
@@ -445,6 +480,309 @@ def run_performance_scenarios(test: TestScenarios):
     test.assert_true(elapsed < 1.0, f"Message retrieval under 1s ({elapsed*1000:.2f}ms)")
 
 
+def run_recovery_scenarios(test: TestScenarios):
+    """Test seed-phrase recovery writes"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 11: ACCOUNT RECOVERY")
+    print("=" * 60)
+    
+    from webapp.utils.passwords import hash_password, hash_seed_phrase
+    
+    username = 'recovery_user'
+    if not store.user_exists(username):
+        store.create_user(username, hash_password('oldpass123'))
+    seed_hash = hash_seed_phrase('recovery seed phrase')
+    store.update_user_profile(username, {'seed_hash': seed_hash})
+    
+    # Test 11.1: Matching seed hash
+    print("\n11.1 Password reset with current seed hash:")
+    new_hash = hash_password('newpass123')
+    test.assert_true(store.update_password_if_matches(username, seed_hash, new_hash),
+                     "Reset accepted when seed hash is unchanged")
+    test.assert_true(store.get_user(username)['password'] == new_hash, "New password hash stored")
+    
+    # Test 11.2: Stale seed hash (changed between verify and write)
+    print("\n11.2 Password reset with stale seed hash:")
+    store.update_user_profile(username, {'seed_hash': hash_seed_phrase('rotated seed phrase')})
+    stale_hash = hash_password('stalepass123')
+    test.assert_false(store.update_password_if_matches(username, seed_hash, stale_hash),
+                      "Reset rejected when seed hash has changed")
+    test.assert_true(store.get_user(username)['password'] == new_hash, "Password left untouched")
+    
+    # Test 11.3: Unknown user
+    print("\n11.3 Password reset for unknown user:")
+    test.assert_false(store.update_password_if_matches('no_such_user', seed_hash, stale_hash),
+                      "Reset rejected for unknown user")
+    
+    # Test 11.4: Seed phrase shown once after registration, never in the cookie
+    print("\n11.4 Seed phrase after registration:")
+    import re
+    from webapp.app import app
+    
+    client = app.test_client()
+    r = client.post('/register', data={'username': 'seed_page_user', 'password': 'password123',
+                                       'age_verified': '1', 'terms_accepted': '1'},
+                    environ_base={'REMOTE_ADDR': '203.0.113.30'})
+    test.assert_true(r.status_code == 302 and r.headers['Location'].endswith('/seed-phrase'),
+                     "Register redirects to the seed phrase page")
+    with client.session_transaction() as sess:
+        cookie_values = list(sess.values())
+    r = client.get('/seed-phrase')
+    words = re.findall(r'<span class="word">(\w+)</span>', r.get_data(as_text=True))
+    test.assert_equal(len(words), 12, "Seed phrase page shows 12 words")
+    test.assert_false(' '.join(words) in cookie_values, "Plaintext phrase not in the session cookie")
+    test.assert_equal(client.get('/seed-phrase').status_code, 302, "Phrase can only be viewed once")
+
+
+def run_rate_limit_scenarios(test: TestScenarios):
+    """Test the auth endpoint rate limiter"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 12: AUTH RATE LIMITING")
+    print("=" * 60)
+    
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    from webapp.app import app
+    from webapp.config import Config
+    
+    limit = Config.AUTH_RATE_LIMIT
+    bad_login = {'username': 'no_such_user', 'password': 'wrongpass'}
+    client = app.test_client()
+    
+    # Test 12.1: Limit reached
+    print("\n12.1 Repeated login attempts:")
+    addr = {'REMOTE_ADDR': '203.0.113.10'}
+    codes = [client.post('/api/auth/login', json=bad_login, environ_base=addr).status_code
+             for _ in range(limit)]
+    test.assert_true(all(code == 401 for code in codes), f"First {limit} attempts reach the handler")
+    r = client.post('/api/auth/login', json=bad_login, environ_base=addr)
+    test.assert_equal(r.status_code, 429, "Next attempt is rate limited")
+    test.assert_true(r.headers.get('Retry-After', '').isdigit(), "429 carries Retry-After")
+    
+    # Test 12.2: Spoofed X-Forwarded-For is ignored when no proxy is trusted
+    print("\n12.2 Spoofed X-Forwarded-For:")
+    codes = [client.post('/api/auth/login', json=bad_login, environ_base=addr,
+                         headers={'X-Forwarded-For': f'1.2.3.{i}'}).status_code
+             for i in range(limit + 1)]
+    test.assert_true(all(code == 429 for code in codes), "Fresh forwarded IPs stay rate limited")
+    
+    # Test 12.3: Other clients and endpoints are unaffected
+    print("\n12.3 Per-client, per-endpoint keys:")
+    r = client.post('/api/auth/login', json=bad_login, environ_base={'REMOTE_ADDR': '203.0.113.11'})
+    test.assert_equal(r.status_code, 401, "Another client is not limited")
+    r = client.post('/api/auth/recover', json={}, environ_base=addr)
+    test.assert_equal(r.status_code, 400, "Another endpoint is not limited")
+    
+    # Test 12.4: Behind one trusted proxy only the hop it appended counts
+    print("\n12.4 Trusted proxy hop:")
+    original = app.wsgi_app
+    app.wsgi_app = ProxyFix(original, x_for=1)
+    try:
+        proxy = {'REMOTE_ADDR': '10.0.0.1'}
+        codes = [client.post('/api/auth/login', json=bad_login, environ_base=proxy,
+                             headers={'X-Forwarded-For': f'1.2.3.{i}, 203.0.113.12'}).status_code
+                 for i in range(limit + 1)]
+    finally:
+        app.wsgi_app = original
+    test.assert_equal(codes[-1], 429, "Client keyed on the proxy-appended address")
+
+
+def run_password_hashing_scenarios(test: TestScenarios):
+    """Test PBKDF2 hashing, legacy hash support and seed normalization"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 13: PASSWORD HASHING")
+    print("=" * 60)
+    
+    from base64 import b64encode
+    from webapp.utils.passwords import hash_password, verify_password, needs_rehash
+    from webapp.routes.auth import normalize_seed_phrase
+    
+    # Test 13.1: PBKDF2 round-trip
+    print("\n13.1 PBKDF2 hash/verify round-trip:")
+    hashed = hash_password('correct horse')
+    test.assert_true(hashed.startswith('pbkdf2_sha256$'), "Hash uses the PBKDF2 format")
+    test.assert_true(verify_password('correct horse', hashed), "Correct password verifies")
+    test.assert_false(verify_password('wrong horse', hashed), "Wrong password is rejected")
+    test.assert_true(hash_password('correct horse') != hashed, "Each hash gets its own salt")
+    test.assert_false(needs_rehash(hashed), "Current hashes need no rehash")
+    test.assert_false(verify_password('correct horse', 'pbkdf2_sha256$x$y$z'), "Malformed hash is rejected")
+    
+    # Test 13.2: Legacy unsalted SHA-256 hashes
+    print("\n13.2 Legacy hash verification:")
+    legacy_hex = hashlib.sha256(b'old secret').hexdigest()
+    legacy_b64 = b64encode(hashlib.sha256(b'old secret').digest()).decode()
+    test.assert_true(verify_password('old secret', legacy_hex), "Legacy hex hash verifies")
+    test.assert_true(verify_password('old secret', legacy_b64), "Legacy base64 hash verifies")
+    test.assert_false(verify_password('new secret', legacy_hex), "Legacy hex rejects wrong password")
+    test.assert_true(needs_rehash(legacy_hex) and needs_rehash(legacy_b64), "Legacy hashes need rehash")
+    
+    # Test 13.3: Legacy hash upgraded on login
+    print("\n13.3 Rehash on login:")
+    from webapp.app import app
+    
+    username = 'legacy_hash_user'
+    if not store.user_exists(username):
+        store.create_user(username, legacy_hex)
+    client = app.test_client()
+    r = client.post('/api/auth/login', json={'username': username, 'password': 'old secret'},
+                    environ_base={'REMOTE_ADDR': '203.0.113.20'})
+    test.assert_equal(r.status_code, 200, "Login with legacy hash succeeds")
+    upgraded = store.get_user(username)['password']
+    test.assert_true(upgraded.startswith('pbkdf2_sha256$'), "Stored hash upgraded to PBKDF2")
+    test.assert_true(verify_password('old secret', upgraded), "Upgraded hash still verifies")
+    
+    # Test 13.4: Seed phrase normalization
+    print("\n13.4 Seed phrase normalization:")
+    test.assert_equal(normalize_seed_phrase('  Alpha\tBRAVO   charlie\n'), 'alpha bravo charlie',
+                      "Whitespace collapsed, stripped and lowercased")
+
+
+def run_bot_install_scenarios(test: TestScenarios):
+    """Test admin-only bot installs into groups and channels"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 14: BOT INSTALL PERMISSIONS")
+    print("=" * 60)
+    
+    # Test 14.1: Groups
+    print("\n14.1 Add bot to group:")
+    group = store.create_group('Bot Install Group', 'alice_free', ['bob_free'])
+    test.assert_equal(store.add_bot_to_group_if_admin(group['id'], 'coingecko', 'alice_free'),
+                      (True, None), "Owner can add a bot")
+    test.assert_equal(store.add_bot_to_group_if_admin(group['id'], 'coingecko', 'alice_free'),
+                      (False, 'exists'), "Adding the same bot again reports exists")
+    test.assert_equal(store.add_bot_to_group_if_admin(group['id'], 'phanes', 'bob_free'),
+                      (False, 'forbidden'), "Plain member is forbidden")
+    test.assert_equal(store.add_bot_to_group_if_admin('no_such_group', 'phanes', 'alice_free'),
+                      (False, 'not_found'), "Unknown group reports not_found")
+    
+    # Test 14.2: Channels
+    print("\n14.2 Add bot to channel:")
+    channel = store.create_channel('Bot Install Channel', '', 'alice_free', '#6366f1', '📢')
+    store.subscribe_to_channel(channel['id'], 'bob_free')
+    store.subscribe_to_channel(channel['id'], 'frank_premium', store.ROLE_ADMIN)
+    test.assert_equal(store.add_bot_to_channel_if_admin(channel['id'], 'coingecko', 'alice_free'),
+                      (True, None), "Owner can add a bot")
+    test.assert_equal(store.add_bot_to_channel_if_admin(channel['id'], 'phanes', 'frank_premium'),
+                      (True, None), "Admin member can add a bot")
+    test.assert_equal(store.add_bot_to_channel_if_admin(channel['id'], 'coingecko', 'frank_premium'),
+                      (False, 'exists'), "Adding the same bot again reports exists")
+    test.assert_equal(store.add_bot_to_channel_if_admin(channel['id'], 'news_bot', 'bob_free'),
+                      (False, 'forbidden'), "Viewer is forbidden")
+    test.assert_equal(store.add_bot_to_channel_if_admin('no_such_channel', 'phanes', 'alice_free'),
+                      (False, 'not_found'), "Unknown channel reports not_found")
+
+
+def run_discover_cache_scenarios(test: TestScenarios):
+    """Test that channel writes invalidate the shared discover rankings"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 15: DISCOVER CACHE")
+    print("=" * 60)
+    
+    def discover_ids(username):
+        return {ch['id'] for ch in store.get_discover_channels_rotated(username)['all']}
+    
+    # Test 15.1: New channel shows up at once
+    print("\n15.1 Channel creation:")
+    discover_ids('bob_free')  # warm the cache
+    channel = store.create_channel('Discover Cache Channel', '', 'alice_free', '#6366f1', '🔭')
+    test.assert_true(channel['id'] in discover_ids('bob_free'), "New channel visible without waiting for TTL")
+    
+    # Test 15.2: Hidden channel drops out at once
+    print("\n15.2 Visibility change:")
+    test.assert_true(store.set_channel_discoverable(channel['id'], False), "Channel hidden")
+    test.assert_false(channel['id'] in discover_ids('bob_free'), "Hidden channel gone from discover")
+    
+    # Test 15.3: Failed write keeps the cache
+    print("\n15.3 Failed write:")
+    cached = store._discover_cache
+    test.assert_false(store.set_channel_discoverable('no_such_channel', True), "Unknown channel not updated")
+    test.assert_true(store._discover_cache is cached, "Cache kept after a failed write")
+    
+    # Test 15.4: A write during a ranking read is not overwritten by the stale result
+    print("\n15.4 Write during ranking read:")
+    store.invalidate_discover_cache()
+    original = store.get_discoverable_channels
+    
+    def read_then_write(*args, **kwargs):
+        result = original(*args, **kwargs)
+        store.set_channel_discoverable(channel['id'], True)
+        return result
+    
+    store.get_discoverable_channels = read_then_write
+    try:
+        stale = store.get_discover_channels_rotated('bob_free')
+    finally:
+        del store.get_discoverable_channels
+    test.assert_false(channel['id'] in {ch['id'] for ch in stale['all']}, "In-flight read saw the old visibility")
+    test.assert_true(store._discover_cache is None, "Stale rankings were not cached")
+    test.assert_true(channel['id'] in discover_ids('bob_free'), "Next read sees the write")
+
+
+def run_bot_report_scenarios(test: TestScenarios):
+    """Test the bounded bot report list"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 16: BOT REPORTS")
+    print("=" * 60)
+    
+    cap = store.MAX_BOT_REPORTS
+    bot = store.create_bot({'name': 'Reported Bot'}, 'grace_premium')
+    
+    # Test 16.1: Reports beyond the cap
+    print(f"\n16.1 Filing {cap + 5} reports:")
+    for i in range(cap + 5):
+        store.report_bot(bot['bot_id'], 'eve_free', f'report {i}')
+    reported = store.get_bot(bot['bot_id'])
+    reasons = [r['reason'] for r in reported['reports']]
+    test.assert_equal(len(reasons), cap, "Only the newest reports are kept")
+    test.assert_equal(reasons[0], 'report 5', "Oldest reports dropped")
+    test.assert_equal(reasons[-1], f'report {cap + 4}', "Newest report kept")
+    test.assert_equal(reported['reports_count'], cap + 5, "reports_count counts every report")
+    
+    # Test 16.2: Unknown bot
+    print("\n16.2 Reporting an unknown bot:")
+    test.assert_false(store.report_bot('no_such_bot', 'eve_free', 'spam'), "Unknown bot not reported")
+
+
+def run_bot_status_scenarios(test: TestScenarios):
+    """Test the admin view of bots grouped by status"""
+    
+    print("\n" + "=" * 60)
+    print("📋 SCENARIO 17: BOTS BY STATUS")
+    print("=" * 60)
+    
+    pending = store.create_bot({'name': 'Status Pending Bot'}, 'grace_premium')
+    approved = store.create_bot({'name': 'Status Approved Bot'}, 'grace_premium')
+    rejected = store.create_bot({'name': 'Status Rejected Bot'}, 'grace_premium')
+    suspended = store.create_bot({'name': 'Status Suspended Bot'}, 'grace_premium')
+    store.approve_bot(approved['bot_id'], 'admin_user')
+    store.reject_bot(rejected['bot_id'], 'admin_user', 'incomplete')
+    store.suspend_bot(suspended['bot_id'], 'admin_user', 'abuse')
+    store.report_bot(approved['bot_id'], 'eve_free', 'spam')
+    
+    grouped = store.get_bots_grouped_by_status()
+    ids = {status: {b['bot_id'] for b in grouped[status]}
+           for status in ('pending', 'approved', 'rejected', 'suspended', 'reported')}
+    
+    # Test 17.1: Each bot lands in its status bucket only
+    print("\n17.1 Status buckets:")
+    for status, bot in (('pending', pending), ('approved', approved),
+                        ('rejected', rejected), ('suspended', suspended)):
+        others = [s for s in ('pending', 'approved', 'rejected', 'suspended') if s != status]
+        test.assert_true(bot['bot_id'] in ids[status] and not any(bot['bot_id'] in ids[s] for s in others),
+                         f"{status.title()} bot only in '{status}'")
+    
+    # Test 17.2: Reported bucket and total
+    print("\n17.2 Reported bots and total:")
+    test.assert_true(approved['bot_id'] in ids['reported'], "Reported bot listed under 'reported'")
+    test.assert_false(pending['bot_id'] in ids['reported'], "Unreported bot not under 'reported'")
+    test.assert_equal(grouped['total'], len(store.get_all_bots()), "Total counts every bot")
+
+
 def main():
     """Run all scenario tests"""
     
@@ -476,6 +814,13 @@ def main():
     run_bot_scenarios(test)
     run_search_scenarios(test)
     run_performance_scenarios(test)
+    run_recovery_scenarios(test)
+    run_rate_limit_scenarios(test)
+    run_password_hashing_scenarios(test)
+    run_bot_install_scenarios(test)
+    run_discover_cache_scenarios(test)
+    run_bot_report_scenarios(test)
+    run_bot_status_scenarios(test)
     
     # Summary
     print("\n" + "=" * 60)
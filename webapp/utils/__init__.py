@@ -18,6 +18,14 @@ from .bot_security import (
     BotAnalytics
 )
 
+from .passwords import (
+    hash_password,
+    verify_password,
+    needs_rehash,
+    hash_seed_phrase,
+    verify_seed_phrase
+)
+
 from .premium_features import (
     PREMIUM_FONTS,
     FONT_CATEGORIES,
@@ -59,6 +67,13 @@ __all__ = [
     'BotVersioning',
     'BotAnalytics',
     
+    # Password hashing
+    'hash_password',
+    'verify_password',
+    'needs_rehash',
+    'hash_seed_phrase',
+    'verify_seed_phrase',
+    
     # Premium features
     'PREMIUM_FONTS',
     'FONT_CATEGORIES',
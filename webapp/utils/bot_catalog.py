@@ -0,0 +1,148 @@
+"""
+🤖 Bot Catalog
+
+The built-in bots shared by the bot store routes and the group chat
+sockets: definitions, their commands, and the command handlers.
+
+FREE BOTS:
+- CoinGecko (crypto prices)
+- Phanes (trading signals)
+
+PREMIUM BOTS:
+- Wallet Tracker
+- Trading Bot
+- News Bot
+"""
+
+# ============================================
+# BOT DEFINITIONS
+# ============================================
+
+FREE_BOTS = {
+    'coingecko': {
+        'id': 'coingecko',
+        'name': 'CoinGecko',
+        'description': 'Get real-time crypto prices',
+        'avatar': '🦎',
+        'commands': [
+            {'command': '/price', 'description': 'Get price', 'usage': '/price BTC'},
+            {'command': '/top', 'description': 'Top coins', 'usage': '/top 10'}
+        ],
+        'free': True
+    },
+    'phanes': {
+        'id': 'phanes',
+        'name': 'Phanes Trading',
+        'description': 'Trading signals and portfolio tracking',
+        'avatar': '🔮',
+        'commands': [
+            {'command': '/trade', 'description': 'Trade info', 'usage': '/trade BTC'},
+            {'command': '/balance', 'description': 'Check balance', 'usage': '/balance'}
+        ],
+        'free': True
+    }
+}
+
+PREMIUM_BOTS = {
+    'wallet_tracker': {
+        'id': 'wallet_tracker',
+        'name': 'Wallet Tracker',
+        'description': 'Track wallet addresses and transactions',
+        'avatar': '👛',
+        'commands': [
+            {'command': '/track', 'description': 'Track wallet', 'usage': '/track 0x...'},
+            {'command': '/txs', 'description': 'Recent transactions', 'usage': '/txs'}
+        ],
+        'free': False
+    },
+    'trading_bot': {
+        'id': 'trading_bot',
+        'name': 'Auto Trader',
+        'description': 'Automated trading strategies',
+        'avatar': '📈',
+        'commands': [
+            {'command': '/strategy', 'description': 'Set strategy', 'usage': '/strategy dca'},
+            {'command': '/pnl', 'description': 'Profit/Loss', 'usage': '/pnl'}
+        ],
+        'free': False
+    },
+    'news_bot': {
+        'id': 'news_bot',
+        'name': 'Crypto News',
+        'description': 'Latest crypto news and alerts',
+        'avatar': '📰',
+        'commands': [
+            {'command': '/news', 'description': 'Latest news', 'usage': '/news'},
+            {'command': '/alert', 'description': 'Set alert', 'usage': '/alert BTC 50000'}
+        ],
+        'free': False
+    }
+}
+
+ALL_BOTS = {**FREE_BOTS, **PREMIUM_BOTS}
+FREE_BOT_IDS = frozenset(FREE_BOTS)
+
+# bot_id -> its slash commands, for O(1) "does this bot handle /x" checks
+BOT_COMMANDS = {
+    bot_id: frozenset(cmd['command'] for cmd in bot['commands'])
+    for bot_id, bot in ALL_BOTS.items()
+}
+
+
+# ============================================
+# COMMAND HANDLERS
+# ============================================
+
+def _coingecko_price(args: list) -> str:
+    coin = args[0].upper() if args else 'BTC'
+    return f"💰 **{coin}** Price\n$45,230.50 (+2.3%)\n_Data from CoinGecko_"
+
+
+def _reply(text: str):
+    """Handler for a command whose response does not depend on its args"""
+    return lambda args: text
+
+
+# bot_id -> {command: handler(args)} - built once at import
+COMMAND_HANDLERS = {
+    'coingecko': {
+        '/price': _coingecko_price,
+        '/top': _reply("🏆 **Top Coins**\n1. BTC $45,230\n2. ETH $2,350\n3. SOL $98"),
+    },
+    'phanes': {
+        '/trade': _reply("📊 **Trade Signal**\nBTC/USD: BUY\nEntry: $45,000\nTarget: $48,000"),
+        '/balance': _reply("💰 **Portfolio**\nBTC: 0.5\nETH: 2.0\nTotal: $26,000"),
+    },
+    'wallet_tracker': {
+        '/track': _reply("👛 **Tracking Wallet**\nAddress added to watchlist"),
+    },
+    'trading_bot': {
+        '/strategy': _reply("📈 **Strategy Set**\nDCA mode activated"),
+        '/pnl': _reply("💹 **P&L Report**\n+$1,250 (+12.5%)"),
+    },
+    'news_bot': {
+        '/news': _reply("📰 **Latest News**\n• Bitcoin hits new high\n• ETH 2.0 update live"),
+    },
+}
+
+# (bot_id, command) pairs whose reply reads args[0] - every other reply is constant
+ARG_COMMANDS = frozenset({('coingecko', '/price')})
+
+# Help text returned for commands a bot doesn't know
+COMMAND_USAGE = {
+    'coingecko': "Use /price <coin> or /top",
+    'phanes': "Use /trade or /balance",
+    'wallet_tracker': "Use /track <address>",
+    'trading_bot': "Use /strategy or /pnl",
+    'news_bot': "Use /news",
+}
+
+
+def process_bot_command(bot_id: str, command: str, args: list) -> str:
+    """Process a bot command and return response"""
+    handlers = COMMAND_HANDLERS.get(bot_id)
+    if not handlers:
+        return "Unknown command"
+    
+    handler = handlers.get(command)
+    return handler(args) if handler else COMMAND_USAGE[bot_id]
@@ -15,6 +15,7 @@ import hashlib
 import secrets
 import time
 import re
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from functools import wraps
@@ -46,7 +47,7 @@ def hash_api_key(raw_key: str) -> str:
     """
     # Use a fixed salt for consistency (in production, use environment variable)
     salt = "menza_bot_salt_v1"
-    return hashlib.sha256(f"{salt}{raw_key}".encode()).hexdigest()
+    return hashlib.sha256(f"{salt}{raw_key}".encode()).digest().hex()
 
 
 def verify_api_key(raw_key: str, stored_hash: str) -> bool:
@@ -231,9 +232,10 @@ class BotPermissions:
     @classmethod
     def get_risk_level(cls, scopes: List[str]) -> str:
         """Get overall risk level for a set of scopes."""
-        if any(cls.SCOPES.get(s, {}).get('risk') == 'high' for s in scopes):
+        risks = {cls.SCOPES[s]['risk'] for s in scopes if s in cls.SCOPES}
+        if 'high' in risks:
             return 'high'
-        elif any(cls.SCOPES.get(s, {}).get('risk') == 'medium' for s in scopes):
+        elif 'medium' in risks:
             return 'medium'
         return 'low'
 
@@ -259,6 +261,12 @@ class BotSecurityScanner:
         r'inject',
     ]
     
+    # Compiled once at class creation - scan_bot checks every pattern per bot
+    _SUSPICIOUS_RES = [(p, re.compile(p)) for p in SUSPICIOUS_PATTERNS]
+    _WEBHOOK_URL_RE = re.compile(
+        r'^https?://[a-zA-Z0-9][-a-zA-Z0-9]*(\.[a-zA-Z0-9][-a-zA-Z0-9]*)+(/.*)?$'
+    )
+    
     # Blocked webhook domains
     BLOCKED_DOMAINS = [
         'localhost',
@@ -301,8 +309,8 @@ class BotSecurityScanner:
         name = bot_data.get('name', '').lower()
         description = bot_data.get('description', '').lower()
         
-        for pattern in cls.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, name) or re.search(pattern, description):
+        for pattern, regex in cls._SUSPICIOUS_RES:
+            if regex.search(name) or regex.search(description):
                 errors.append(f"Suspicious term detected: '{pattern}'")
                 score -= 30
         
@@ -379,8 +387,7 @@ class BotSecurityScanner:
                 })
         
         # Check for valid URL format
-        url_pattern = r'^https?://[a-zA-Z0-9][-a-zA-Z0-9]*(\.[a-zA-Z0-9][-a-zA-Z0-9]*)+(/.*)?$'
-        if not re.match(url_pattern, url):
+        if not cls._WEBHOOK_URL_RE.match(url):
             issues.append({
                 'type': 'warning',
                 'message': 'Webhook URL format may be invalid'
@@ -403,8 +410,8 @@ class BotRateLimiter:
         'messages': {'requests': 100, 'window': 3600},  # 100 msg/hour per target
     }
     
-    # In-memory rate limit tracking
-    _requests: Dict[str, List[float]] = {}
+    # In-memory rate limit tracking - timestamps oldest first
+    _requests: Dict[str, deque] = {}
     
     @classmethod
     def check_rate_limit(cls, bot_id: str, limit_type: str = 'default') -> Tuple[bool, dict]:
@@ -420,16 +427,17 @@ class BotRateLimiter:
         window = config['window']
         max_requests = config['requests']
         
-        # Clean old requests
-        if key in cls._requests:
-            cls._requests[key] = [t for t in cls._requests[key] if now - t < window]
-        else:
-            cls._requests[key] = []
+        # Clean old requests - they sit at the front, so stop at the first live one
+        requests = cls._requests.get(key)
+        if requests is None:
+            requests = cls._requests[key] = deque()
+        while requests and now - requests[0] >= window:
+            requests.popleft()
         
-        current_count = len(cls._requests[key])
+        current_count = len(requests)
         
         if current_count >= max_requests:
-            retry_after = window - (now - cls._requests[key][0])
+            retry_after = window - (now - requests[0])
             return False, {
                 'allowed': False,
                 'limit': max_requests,
@@ -439,7 +447,7 @@ class BotRateLimiter:
             }
         
         # Record this request
-        cls._requests[key].append(now)
+        requests.append(now)
         
         return True, {
             'allowed': True,
@@ -587,8 +595,7 @@ class PremiumFeatures:
         
         # Check if user is premium
         if store:
-            user = store.get_user(username)
-            if user and user.get('premium', False):
+            if store.is_user_premium(username):
                 return True, "Premium user"
             
             # Check for free tier limits
@@ -691,23 +698,24 @@ class BotAnalytics:
     """Track and analyze bot usage."""
     
     # In-memory analytics (in production, use database)
-    _events: Dict[str, List[dict]] = {}
+    _events: Dict[str, deque] = {}
+    
+    # Events kept per bot
+    MAX_EVENTS = 1000
     
     @classmethod
     def track_event(cls, bot_id: str, event_type: str, data: dict = None) -> None:
         """Track an analytics event."""
-        if bot_id not in cls._events:
-            cls._events[bot_id] = []
+        events = cls._events.get(bot_id)
+        if events is None:
+            # Bounded deque drops the oldest event in O(1) - no list re-slice per event
+            events = cls._events[bot_id] = deque(maxlen=cls.MAX_EVENTS)
         
-        cls._events[bot_id].append({
+        events.append({
             'type': event_type,
             'data': data or {},
             'timestamp': datetime.now().isoformat()
         })
-        
-        # Keep only last 1000 events per bot
-        if len(cls._events[bot_id]) > 1000:
-            cls._events[bot_id] = cls._events[bot_id][-1000:]
     
     @classmethod
     def get_stats(cls, bot_id: str, days: int = 7) -> dict:
@@ -769,4 +777,3 @@ class BotAnalytics:
         # Sort by date and return last N days
         result = sorted(daily.values(), key=lambda x: x['date'], reverse=True)
         return result[:days]
-
@@ -0,0 +1,82 @@
+"""
+🔑 Password Hashing
+
+Salted PBKDF2-HMAC-SHA256 for passwords and seed phrases, shared by the
+auth routes and the data store. Legacy unsalted SHA-256 hashes still verify
+and are flagged by needs_rehash() for upgrade on next use.
+"""
+
+import hashlib
+import hmac
+from base64 import b64encode, b64decode
+from os import urandom
+
+# Bound once - every login/register/recover hashes through these
+_sha256 = hashlib.sha256
+_pbkdf2 = hashlib.pbkdf2_hmac
+
+# OpenSSL's SHA-256 uses the CPU's SHA extensions; the builtin fallback does not
+if getattr(_sha256, '__name__', '') != 'openssl_sha256':
+    print("⚠️ hashlib is not OpenSSL-backed - auth hashing will be slow", flush=True)
+
+
+# Current format: pbkdf2_sha256$<iterations>$<b64 salt>$<b64 hash>
+# pbkdf2_hmac runs in C with the GIL released, so concurrent logins overlap
+_PBKDF2_PREFIX = 'pbkdf2_sha256'
+_PBKDF2_ITERATIONS = 100_000
+_SALT_BYTES = 16
+
+# Older unsalted SHA-256 hashes: 64-char hex, or base64 of the raw digest
+_LEGACY_HEX_LEN = 64
+
+
+def _hash(value: str) -> str:
+    """Salted PBKDF2-HMAC-SHA256 of a string, in the self-describing format"""
+    salt = urandom(_SALT_BYTES)
+    digest = _pbkdf2('sha256', value.encode(), salt, _PBKDF2_ITERATIONS)
+    return f"{_PBKDF2_PREFIX}${_PBKDF2_ITERATIONS}${b64encode(salt).decode()}${b64encode(digest).decode()}"
+
+
+def _verify_hash(value: str, hashed: str) -> bool:
+    """Constant-time check of a value against a PBKDF2 or legacy SHA-256 hash"""
+    if hashed.startswith(_PBKDF2_PREFIX + '$'):
+        try:
+            _, iterations, salt, digest = hashed.split('$')
+            expected = b64decode(digest)
+            actual = _pbkdf2('sha256', value.encode(), b64decode(salt), int(iterations))
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+    if len(hashed) == _LEGACY_HEX_LEN:
+        return hmac.compare_digest(_sha256(value.encode()).digest().hex(), hashed)
+    return hmac.compare_digest(b64encode(_sha256(value.encode()).digest()).decode(), hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True for legacy or under-iterated hashes that should be rewritten"""
+    if not hashed.startswith(_PBKDF2_PREFIX + '$'):
+        return True
+    try:
+        return int(hashed.split('$')[1]) < _PBKDF2_ITERATIONS
+    except ValueError:
+        return True
+
+
+def hash_password(password: str) -> str:
+    """Securely hash a password using salted PBKDF2"""
+    return _hash(password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Verify a password against its hash (constant-time)"""
+    return _verify_hash(password, hashed)
+
+
+def hash_seed_phrase(seed_phrase):
+    """Hash the seed phrase for storage"""
+    return _hash(seed_phrase)
+
+
+def verify_seed_phrase(seed_phrase: str, hashed: str) -> bool:
+    """Verify a seed phrase against its stored hash (constant-time)"""
+    return _verify_hash(seed_phrase, hashed)